@@ -1,94 +1,96 @@
-import pandas as pd
-from datetime import datetime, timedelta
-import os
-from email_sender import send_alert_email # Importa la nueva función de alerta
+import argparse
+from datetime import date, datetime, timedelta
+from email_sender import send_alert_email, send_alert_digest # Importa las funciones de alerta
+from registro_contratos import registro
+from bandeja_correo import bandeja_salida
 
 # --- Configuración ---
-EXCEL_FILE = "contratos_lab.xlsx"
 DAYS_BEFORE_EXPIRATION = 40
 # Puedes ajustar los destinatarios aquí, o leerlos de variables de entorno si se hace más complejo.
 ALERT_RECIPIENTS = ["gestionhumana@ingeurbanismo.com"]
 # Si también quieres notificar a técnica, descomenta la línea de abajo y ajusta el array.
 # ALERT_RECIPIENTS = ["gtecnica@ingeurbanismo.com", "gestionhumana@ingeurbanismo.com"]
+# Modo resumen: un solo correo por destinatario con todos los contratos de la ventana de alerta,
+# en vez de un correo por contrato. Con `python alert_checker.py --individual` se usa el modo anterior.
+DIGEST_MODE = True
 
-def check_and_send_alerts():
+# Contratos con fecha no válida que se nombran en el aviso (del resto solo se da la cantidad)
+MAX_FECHAS_INVALIDAS_LISTADAS = 20
+
+def check_and_send_alerts(digest=DIGEST_MODE):
     """
-    Verifica los contratos en el Excel y envía alertas para aquellos próximos a vencer.
+    Verifica los contratos del registro y envía alertas para aquellos próximos a vencer.
+
+    Args:
+        digest (bool): Enviar todas las alertas en un único correo resumen por destinatario.
+            Cada contrato incluido se marca igual como alertado, así no se repite en el siguiente resumen.
     """
     print(f"[{datetime.now()}] Iniciando verificación de alertas de contratos...")
 
-    if not os.path.exists(EXCEL_FILE):
-        print(f"[{datetime.now()}] Advertencia: El archivo {EXCEL_FILE} no existe. No se pueden verificar alertas.")
-        return
+    today = datetime.now().date()
+    alerts_sent_count = 0
 
+    # Solo se leen los contratos cuya fecha final cae en la ventana de alerta: una consulta por
+    # rango sobre el índice de vencimientos del registro, no un recorrido de todo el historial
     try:
-        df = pd.read_excel(EXCEL_FILE)
+        por_vencer = registro.contratos_por_vencer((today + timedelta(days=1)).isoformat(),
+                                                   (today + timedelta(days=DAYS_BEFORE_EXPIRATION)).isoformat())
+        # Si el contrato ya venció y la alerta se envió, se resetea la alerta
+        cambios = dict.fromkeys(registro.alertas_vencidas(today.isoformat()), False)
+        invalidas = registro.fechas_fin_invalidas()
     except Exception as e:
-        print(f"[{datetime.now()}] Error al leer el archivo Excel {EXCEL_FILE}: {e}")
+        print(f"[{datetime.now()}] Error al leer el registro de contratos {registro.db_file}: {e}")
         return
 
-    if df.empty:
-        print(f"[{datetime.now()}] El archivo {EXCEL_FILE} está vacío. No hay contratos para verificar.")
-        return
+    if invalidas:
+        print(f"[{datetime.now()}] {len(invalidas)} contratos con fecha final estimada no válida, no se verifican: "
+              f"{', '.join(map(str, invalidas[:MAX_FECHAS_INVALIDAS_LISTADAS]))}{' ...' if len(invalidas) > MAX_FECHAS_INVALIDAS_LISTADAS else ''}")
 
-    today = datetime.now().date()
-    updated_df = df.copy()
-    alerts_sent_count = 0
+    # {id del contrato: (datos del contrato, días restantes)}
+    alertas = {}
+    for index, fecha_fin, contract_data_for_alert in por_vencer:
+        days_left = (date.fromisoformat(fecha_fin) - today).days
+        alertas[index] = (contract_data_for_alert, days_left)
+        print(f"[{datetime.now()}] Alerta detectada para contrato {contract_data_for_alert.get('contract_number', 'N/A')} de {contract_data_for_alert.get('contractor_name', 'N/A')}. Faltan {days_left} días.")
 
-    # Asegurarse de que la columna de estado de alerta exista
-    if 'Alerta_40_Dias_Enviada' not in updated_df.columns:
-        updated_df['Alerta_40_Dias_Enviada'] = False
-        print(f"[{datetime.now()}] Columna 'Alerta_40_Dias_Enviada' creada en el DataFrame.")
+    if digest and alertas:
+        ids = send_alert_digest(list(alertas.values()), ALERT_RECIPIENTS)
+        # Solo se marcan si el resumen quedó en la bandeja; si no, se incluyen en el siguiente
+        if ids is not None:
+            cambios.update(dict.fromkeys(alertas, True))
+            alerts_sent_count += len(alertas)
+    elif alertas:
+        for index, (contract_data_for_alert, days_left) in alertas.items():
+            try:
+                # Envía el correo de alerta; si no quedó en la bandeja, se reintenta en la siguiente ejecución
+                if send_alert_email(contract_data_for_alert, ALERT_RECIPIENTS, days_left) is None:
+                    continue
+                cambios[index] = True # Marca como enviada
+                alerts_sent_count += 1
+            except Exception as e:
+                print(f"[{datetime.now()}] Error procesando contrato {contract_data_for_alert.get('contract_number', 'N/A')}: {e}")
 
-    for index, row in updated_df.iterrows():
+    # Solo se escriben las banderas que cambiaron (alertas enviadas y alertas reseteadas)
+    if cambios:
         try:
-            estimated_end_date_str = str(row.get('estimated_end_date'))
-            if pd.isna(estimated_end_date_str) or estimated_end_date_str == 'NaT' or estimated_end_date_str == '':
-                # print(f"[{datetime.now()}] Contrato {row.get('contract_number', 'N/A')}: Fecha final estimada no válida o ausente. Saltando.")
-                continue
-
-            # Convertir la fecha, manejando posibles formatos (solo nos interesa la parte de la fecha)
-            if ' ' in estimated_end_date_str: # Si incluye hora, separar
-                estimated_end_date = datetime.strptime(estimated_end_date_str.split(' ')[0], '%Y-%m-%d').date()
-            elif '/' in estimated_end_date_str: # Manejar formato MM/DD/YYYY o DD/MM/YYYY si es necesario (asumiendo que viene de un input date como YYYY-MM-DD)
-                 # Mejor intentar varios formatos comunes si el origen no es 100% consistente
-                try:
-                    estimated_end_date = datetime.strptime(estimated_end_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        estimated_end_date = datetime.strptime(estimated_end_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        estimated_end_date = datetime.strptime(estimated_end_date_str, '%d/%m/%Y').date()
-            else: # Asumir YYYY-MM-DD
-                estimated_end_date = datetime.strptime(estimated_end_date_str, '%Y-%m-%d').date()
-            
-            days_left = (estimated_end_date - today).days
-            alert_already_sent = row.get('Alerta_40_Dias_Enviada', False)
-
-            if DAYS_BEFORE_EXPIRATION >= days_left > 0 and not alert_already_sent:
-                print(f"[{datetime.now()}] Alerta detectada para contrato {row.get('contract_number', 'N/A')} de {row.get('contractor_name', 'N/A')}. Faltan {days_left} días.")
-                # Envía el correo de alerta
-                contract_data_for_alert = row.to_dict()
-                send_alert_email(contract_data_for_alert, ALERT_RECIPIENTS, days_left)
-                updated_df.loc[index, 'Alerta_40_Dias_Enviada'] = True # Marca como enviada
-                alerts_sent_count += 1
-            elif days_left <= 0 and alert_already_sent: # Si el contrato ya venció y la alerta se envió, resetear la alerta
-                 updated_df.loc[index, 'Alerta_40_Dias_Enviada'] = False
-                 # print(f"[{datetime.now()}] Contrato {row.get('contract_number', 'N/A')} vencido, alerta reseteada.")
-            
+            registro.actualizar_alertas(cambios)
         except Exception as e:
-            print(f"[{datetime.now()}] Error procesando contrato {row.get('contract_number', 'N/A')}: {e}")
+            print(f"[{datetime.now()}] Error al actualizar el estado de las alertas en el registro: {e}")
 
     if alerts_sent_count > 0:
-        try:
-            updated_df.to_excel(EXCEL_FILE, index=False) # Guarda el DataFrame actualizado
-            print(f"[{datetime.now()}] {alerts_sent_count} alertas enviadas y el archivo Excel {EXCEL_FILE} ha sido actualizado.")
-        except Exception as e:
-            print(f"[{datetime.now()}] Error al guardar el archivo Excel actualizado: {e}")
+        print(f"[{datetime.now()}] {alerts_sent_count} alertas enviadas y el registro {registro.db_file} ha sido actualizado.")
     else:
         print(f"[{datetime.now()}] No se encontraron nuevas alertas de contratos para enviar.")
 
+    # Las alertas quedaron en la bandeja de salida; el script las envía antes de terminar
+    # (las que fallen quedan en la bandeja y las reintenta la aplicación)
+    if alerts_sent_count > 0:
+        bandeja_salida.vaciar()
+
     print(f"[{datetime.now()}] Verificación de alertas de contratos finalizada.")
 
 if __name__ == '__main__':
-    check_and_send_alerts()
+    parser = argparse.ArgumentParser(description="Envía alertas de los contratos próximos a vencer.")
+    parser.add_argument('--individual', action='store_true', help="Un correo por contrato en lugar del resumen por destinatario")
+    args = parser.parse_args()
+    check_and_send_alerts(digest=DIGEST_MODE and not args.individual)
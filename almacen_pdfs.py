@@ -0,0 +1,232 @@
+# almacen_pdfs.py
+# Almacén de los PDFs de contratos en pdfs_laboral.
+# Los PDFs se reparten en subcarpetas por año, mes y tipo de contrato:
+#   pdfs_laboral/2025/03/Obra_o_Labor/Contrato_Obra_Labor_0016_ROBERTO_PEREZ.pdf
+# Los nombres se arman solo con letras sin tilde, números, '.', '-' y '_'. Si dos contratos
+# dan el mismo nombre, el segundo recibe un sufijo (_2, _3, ...) y nunca se sobrescriben.
+# Cada PDF guardado queda en el índice archivos_pdf del registro (número de contrato ->
+# ruta, tamaño y sha256), así ubicar un contrato es una consulta y no un recorrido de la carpeta.
+# Los PDFs de contratos vencidos hace tiempo pasan a ZIPs anuales (ver archivado_pdfs.py);
+# abrir() y leer_archivado() los devuelven igual que a los sueltos.
+#
+# Uso:
+#   python almacen_pdfs.py --migrar      # mueve los PDFs de la carpeta plana a las subcarpetas
+#   python almacen_pdfs.py --verificar   # comprueba tamaño y checksum de los PDFs del índice
+
+import argparse
+import hashlib
+import io
+import os
+import posixpath
+import re
+import unicodedata
+import zipfile
+from datetime import date, datetime
+
+from registro_contratos import registro
+from pdf_generators_lab.motor_pdf import DIRECTORIO_PDFS, guardar_pdf, renderizar_contrato, ruta_pdf_plana
+from pdf_generators_lab.tipos_contrato import DEFINICIONES
+
+# Longitud máxima de cada parte del nombre de archivo (número de contrato, trabajador)
+LONGITUD_MAXIMA_FRAGMENTO = 60
+# Fechas del contrato con las que se elige la subcarpeta, en orden de preferencia
+CAMPOS_FECHA_ALMACEN = ('contract_date', 'start_date')
+
+
+def _fragmento(texto, por_defecto):
+    """Convierte un texto en una parte segura de nombre de archivo: 'José Peña / 01' -> 'Jose_Pena_01'."""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    texto = re.sub(r'[^A-Za-z0-9.-]+', '_', texto).strip('._-')
+    return texto[:LONGITUD_MAXIMA_FRAGMENTO].rstrip('._-') or por_defecto
+
+
+def _fecha_contrato(datos):
+    for campo in CAMPOS_FECHA_ALMACEN:
+        try:
+            return datetime.strptime(str(datos.get(campo) or '')[:10], '%Y-%m-%d').date()
+        except ValueError:
+            continue
+    return date.today()
+
+
+def _sha256(contenido):
+    return hashlib.sha256(contenido).hexdigest()
+
+
+class AlmacenPDF:
+    """PDFs en subcarpetas año/mes/tipo, con su índice en el registro de contratos."""
+
+    def __init__(self, directorio=DIRECTORIO_PDFS, registro=registro):
+        self.directorio = directorio
+        self.registro = registro
+
+    def ruta_absoluta(self, ruta_relativa):
+        return os.path.join(self.directorio, *ruta_relativa.split('/'))
+
+    def ruta_propuesta(self, definicion, datos):
+        """Ruta relativa (con '/') que le corresponde a un contrato si aún no tiene PDF guardado."""
+        fecha = _fecha_contrato(datos)
+        nombre = "_".join((
+            definicion.prefijo_archivo,
+            _fragmento(datos.get('contract_number'), 'SNC'),
+            _fragmento(datos.get('contractor_name'), 'trabajador'),
+        ))
+        return f"{fecha:%Y}/{fecha:%m}/{_fragmento(definicion.nombre, 'Otros')}/{nombre}.pdf"
+
+    def guardar(self, definicion, datos, contenido):
+        """
+        Guarda el PDF de un contrato, lo registra en el índice y devuelve su ruta.
+        Si el contrato ya tenía un PDF guardado se reemplaza en el mismo lugar.
+        """
+        sha256 = _sha256(contenido)
+        # Sin número de contrato la entrada del índice se identifica por el contenido,
+        # así dos contratos sin número no comparten (ni pisan) el mismo archivo
+        numero = datos.get('contract_number') or f"SNC-{sha256[:16]}"
+        # Primero se reserva la ruta, luego se escribe el archivo y solo entonces el índice
+        # registra su tamaño y checksum: si la escritura falla, el índice no describe un
+        # contenido que no está en disco (ni da por suelto un PDF que sigue archivado)
+        ruta_relativa = self.registro.reservar_ruta_pdf(numero, self.ruta_propuesta(definicion, datos))
+        ruta = guardar_pdf(self.ruta_absoluta(ruta_relativa), contenido)
+        self.registro.confirmar_pdf(numero, len(contenido), sha256)
+        return ruta
+
+    def ubicar(self, numero_contrato):
+        """
+        Ruta del PDF suelto de un contrato según el índice, o None si no tiene, si el archivo
+        ya no está o si el PDF fue archivado (ver leer_archivado).
+        """
+        entrada = self.registro.buscar_pdf(numero_contrato)
+        if entrada is None or entrada['archivado_en'] is not None:
+            return None
+        ruta = self.ruta_absoluta(entrada['ruta'])
+        return ruta if os.path.exists(ruta) else None
+
+    def _leer_de_zip(self, entrada):
+        with zipfile.ZipFile(self.ruta_absoluta(entrada['archivado_en'])) as archivo_zip:
+            return archivo_zip.read(entrada['ruta'])
+
+    def leer_archivado(self, numero_contrato):
+        """
+        Lee el PDF de un contrato que está en un ZIP anual.
+
+        Returns:
+            tuple: (nombre del archivo, contenido, sha256), o None si el PDF no está archivado.
+        """
+        entrada = self.registro.buscar_pdf(numero_contrato)
+        if entrada is None or entrada['archivado_en'] is None:
+            return None
+        try:
+            contenido = self._leer_de_zip(entrada)
+        except (FileNotFoundError, KeyError) as e:
+            print(f"No se encontró el PDF archivado de '{numero_contrato}' en {entrada['archivado_en']}: {e}")
+            return None
+        return posixpath.basename(entrada['ruta']), contenido, entrada['sha256']
+
+    def abrir(self, contrato):
+        """
+        Abre para lectura el PDF de un contrato del registro, esté suelto o archivado; si no
+        tiene PDF se obtiene con obtener_ruta.
+
+        Returns:
+            tuple: (nombre del archivo, archivo binario abierto), o None si no se pudo obtener.
+        """
+        numero = contrato.get('contract_number')
+        archivado = self.leer_archivado(numero)
+        if archivado is not None:
+            return archivado[0], io.BytesIO(archivado[1])
+        ruta = self.obtener_ruta(contrato)
+        if ruta is None:
+            return None
+        return os.path.basename(ruta), open(ruta, 'rb')
+
+    def obtener_ruta(self, contrato):
+        """
+        Devuelve la ruta del PDF de un contrato del registro. Si no está en el índice se adopta
+        el archivo de la carpeta plana, si existe, y si no se genera de nuevo con los datos guardados.
+
+        Los PDFs archivados no tienen ruta suelta: se leen con leer_archivado o abrir.
+
+        Returns:
+            str: La ruta del PDF, o None si el tipo no tiene generador, el PDF no se pudo
+            generar o está archivado.
+        """
+        entrada = self.registro.buscar_pdf(contrato.get('contract_number'))
+        if entrada is not None:
+            if entrada['archivado_en'] is not None:
+                return None
+            ruta = self.ruta_absoluta(entrada['ruta'])
+            if os.path.exists(ruta):
+                return ruta
+        definicion = DEFINICIONES.get(contrato.get('tipo_contrato'))
+        if definicion is None:
+            return None
+        ruta = self._adoptar(definicion, contrato)
+        if ruta is not None:
+            return ruta
+        contenido = renderizar_contrato(definicion, contrato, en_memoria=True)
+        if contenido is None:
+            return None
+        return self.guardar(definicion, contrato, contenido)
+
+    def _adoptar(self, definicion, contrato):
+        """Mueve al almacén el PDF que el contrato tenga en la carpeta plana. Devuelve su nueva ruta o None."""
+        ruta_anterior = ruta_pdf_plana(definicion, contrato)
+        if not os.path.isfile(ruta_anterior):
+            return None
+        with open(ruta_anterior, 'rb') as f:
+            contenido = f.read()
+        ruta = self.guardar(definicion, contrato, contenido)
+        os.remove(ruta_anterior)
+        return ruta
+
+    def migrar_carpeta_plana(self):
+        """Adopta los PDFs de la carpeta plana de todos los contratos del registro. Devuelve cuántos movió."""
+        movidos = 0
+        for contrato in self.registro.iterar_contratos():
+            definicion = DEFINICIONES.get(contrato.get('tipo_contrato'))
+            if definicion is None or self.registro.buscar_pdf(contrato.get('contract_number')) is not None:
+                continue
+            ruta = self._adoptar(definicion, contrato)
+            if ruta is not None:
+                movidos += 1
+                print(f"Movido: {os.path.relpath(ruta, self.directorio)}")
+        return movidos
+
+    def verificar(self):
+        """Compara cada PDF del índice con su tamaño y checksum. Devuelve la lista de problemas."""
+        problemas = []
+        for entrada in self.registro.iterar_pdfs():
+            ubicacion = entrada['ruta'] if entrada['archivado_en'] is None else f"{entrada['archivado_en']}:{entrada['ruta']}"
+            try:
+                if entrada['archivado_en'] is None:
+                    with open(self.ruta_absoluta(entrada['ruta']), 'rb') as f:
+                        contenido = f.read()
+                else:
+                    contenido = self._leer_de_zip(entrada)
+            except (FileNotFoundError, KeyError):
+                problemas.append(f"{entrada['contract_number']}: falta {ubicacion}")
+                continue
+            if len(contenido) != entrada['tamano'] or _sha256(contenido) != entrada['sha256']:
+                problemas.append(f"{entrada['contract_number']}: {ubicacion} no coincide con el índice")
+        return problemas
+
+
+# Almacén compartido por la aplicación, la carga masiva y los generadores
+almacen_pdfs = AlmacenPDF()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mantenimiento del almacén de PDFs de contratos.")
+    parser.add_argument('--migrar', action='store_true', help="Mover los PDFs de la carpeta plana a las subcarpetas año/mes/tipo")
+    parser.add_argument('--verificar', action='store_true', help="Comprobar tamaño y checksum de los PDFs del índice")
+    args = parser.parse_args()
+    if not (args.migrar or args.verificar):
+        parser.error("Indique --migrar o --verificar.")
+
+    if args.migrar:
+        print(f"Migración terminada: {almacen_pdfs.migrar_carpeta_plana()} PDFs movidos a subcarpetas.")
+    if args.verificar:
+        problemas = almacen_pdfs.verificar()
+        for problema in problemas:
+            print(f"⚠️ {problema}")
+        print(f"Verificación terminada: {len(problemas)} problemas encontrados.")
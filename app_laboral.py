@@ -1,9 +1,12 @@
 # app_laboral.py
 # Este es el archivo principal de la aplicación Flask para generar contratos laborales.
 
-from flask import Flask, render_template, request, redirect
-import pandas as pd
+import io
+import itertools
 import os
+from urllib.parse import quote
+from flask import Flask, render_template, request, redirect, jsonify, Response, send_file
+from werkzeug.utils import secure_filename
 
 # funcion de cada archivo pdf:
 
@@ -13,6 +16,16 @@ from pdf_generators_lab.termino_fijo_pdf import generar_pdf_termino_fijo
 from pdf_generators_lab.termino_indefinido_pdf import generar_pdf_termino_indefinido
 #from pdf_generators_lab.teletrabajo_pdf import generar_pdf_teletrabajo
 from email_sender import send_contract_email
+from registro_contratos import (
+    registro, ContratoDuplicadoError, TAMANO_PAGINA_POR_DEFECTO, CORREO_PENDIENTE, CORREO_ENVIANDO, CORREO_FALLIDO,
+)
+from exportacion_contratos import GENERADORES, FORMATOS_EXPORTACION
+from carga_masiva import leer_nomina, procesar_nomina, EXTENSIONES_NOMINA, PASOS_CARGA
+from pdf_generators_lab.tipos_contrato import GENERADORES_PDF, DEFINICIONES
+from paquetes_contratos import GENERADORES_PAQUETE, FORMATOS_PAQUETE
+from almacen_pdfs import almacen_pdfs
+from trabajos import cola_trabajos
+from bandeja_correo import bandeja_salida, MAX_INTENTOS
 
 app = Flask(__name__)
 
@@ -52,52 +65,294 @@ def form_termino_indefinido():
 
 @app.route("/lista-contratos-laborales")
 def lista_contratos_laborales():
-    """Lee y muestra los datos de los contratos laborales desde un archivo Excel."""
-    excel_file = "contratos_lab.xlsx"
-    if os.path.exists(excel_file):
+    """
+    Muestra una página de los contratos laborales del registro.
+
+    Parámetros de consulta: pagina, tamano, orden (columna), dir (asc/desc), q (búsqueda)
+    y formato=json para obtener solo los datos de la página (los usa la tabla al paginar).
+    """
+    try:
+        # La vista del registro se mantiene en caché y solo se recarga cuando cambia
+        resultado = registro.consultar_contratos(
+            pagina=request.args.get('pagina', 1, type=int),
+            tamano=request.args.get('tamano', TAMANO_PAGINA_POR_DEFECTO, type=int),
+            orden=request.args.get('orden'),
+            descendente=request.args.get('dir') == 'desc',
+            filtro=request.args.get('q', ''),
+        )
+    except Exception as e:
+        if request.args.get('formato') == 'json':
+            return jsonify(error=f"Error al leer el registro de contratos: {e}"), 500
+        return f"Error al leer el registro de contratos: {e}"
+
+    if request.args.get('formato') == 'json':
+        return jsonify(resultado)
+    if not resultado['columnas']:
+        return "No hay contratos laborales registrados."
+    return render_template("tabla_contratos_laborales.html", **resultado)
+
+
+# --- RUTA PARA EXPORTAR EL REGISTRO ---
+
+@app.route("/export/contratos.<formato>")
+def exportar_contratos(formato):
+    """
+    Exporta el registro en CSV, XLSX o JSONL como respuesta transmitida por partes.
+
+    Filtros opcionales: desde y hasta (fecha de inicio, AAAA-MM-DD), proyecto y tipo_contrato.
+    """
+    if formato not in GENERADORES:
+        return f"Formato no soportado: {formato}. Use csv, xlsx o jsonl.", 404
+    contratos = registro.iterar_contratos(
+        desde=request.args.get('desde'),
+        hasta=request.args.get('hasta'),
+        proyecto=request.args.get('proyecto'),
+        tipo_contrato=request.args.get('tipo_contrato'),
+    )
+    cuerpo = GENERADORES[formato](registro.columnas_exportacion(), contratos)
+    return Response(
+        cuerpo,
+        mimetype=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f"attachment; filename=contratos.{formato}"},
+    )
+
+
+# --- RUTA PARA CONSULTAR UN CONTRATO POR NÚMERO ---
+
+@app.route("/contrato/<contract_number>")
+def consultar_contrato(contract_number):
+    """Devuelve en JSON los datos de un contrato, buscándolo por el índice de contract_number."""
+    contrato = registro.buscar_por_numero(contract_number)
+    if contrato is None:
+        return jsonify(error=f"No existe un contrato con el número '{contract_number}'."), 404
+    return jsonify(contrato)
+
+
+# --- RUTA PARA LA CARGA MASIVA DE CONTRATOS ---
+
+@app.route("/bulk", methods=["GET", "POST"])
+def carga_masiva():
+    """Muestra el formulario de carga masiva y, al subir una nómina, genera sus contratos."""
+    contexto = {
+        'tipos': list(GENERADORES_PDF),
+        'tipo_seleccionado': request.form.get('tipo_contrato', "Obra o Labor"),
+        'extensiones': EXTENSIONES_NOMINA,
+        'resultados': None,
+        'error': None,
+    }
+    if request.method == "POST":
+        archivo = request.files.get('nomina')
+        if archivo is None or not archivo.filename:
+            contexto['error'] = "Seleccione un archivo de nómina."
+            return render_template("carga_masiva.html", **contexto), 400
         try:
-            df = pd.read_excel(excel_file)
-            if df.empty:
-                return "El archivo de contratos laborales está vacío."
-            df = df.fillna('') 
-            return render_template("tabla_contratos_laborales.html", data=df.to_dict(orient="records"))
+            filas = leer_nomina(archivo.stream, archivo.filename)
         except Exception as e:
-            return f"Error al leer el archivo Excel: {e}"
-    return "No hay contratos laborales registrados o el archivo no existe."
+            contexto['error'] = f"No se pudo leer la nómina: {e}"
+            return render_template("carga_masiva.html", **contexto), 400
+        # Los PDFs se generan en la cola de trabajos, como en el formulario de un contrato:
+        # la respuesta no espera a toda la nómina y el avance se consulta en /jobs/<id>
+        trabajo = cola_trabajos.encolar(
+            f"Carga masiva {archivo.filename} ({len(filas)} filas)",
+            generar_carga_masiva, filas, contexto['tipo_seleccionado'], bool(request.form.get('enviar_correos')),
+            total_pasos=PASOS_CARGA,
+            resultado={'carga_masiva': True, 'tipo_seleccionado': contexto['tipo_seleccionado']},
+        )
+        return redirect(f"/jobs/{trabajo.id}")
+    return render_template("carga_masiva.html", **contexto)
+
+def generar_carga_masiva(trabajo, filas, tipo_por_defecto, enviar_correos):
+    """Trabajo en segundo plano: registra la nómina, genera sus PDFs y encola los correos."""
+    resultados = procesar_nomina(
+        filas, tipo_por_defecto=tipo_por_defecto, enviar_correos=enviar_correos, avanzar=trabajo.avanzar,
+    )
+    # La ruta del PDF en el servidor no se publica: cada PDF se descarga con /pdf/<numero>
+    trabajo.resultado['resultados'] = [{k: v for k, v in r.items() if k != 'pdf'} for r in resultados]
+    trabajo.resultado['correctos'] = sum(r['estado'] == 'ok' for r in resultados)
+
+
+# --- RUTAS PARA CONSULTAR LOS TRABAJOS EN SEGUNDO PLANO ---
+
+@app.route("/jobs/<id_trabajo>")
+def estado_trabajo(id_trabajo):
+    """Muestra el avance de un trabajo; con formato=json devuelve solo su estado (lo usa la página al refrescar)."""
+    trabajo = cola_trabajos.obtener(id_trabajo)
+    if trabajo is None:
+        if request.args.get('formato') == 'json':
+            return jsonify(error=f"No existe el trabajo '{id_trabajo}'."), 404
+        return f"No existe el trabajo '{id_trabajo}'.", 404
+    estado = trabajo.como_dict()
+    if request.args.get('formato') == 'json':
+        return jsonify(estado)
+    if 'resultados' in estado['resultado']:
+        # Carga masiva terminada: se muestra el resultado de cada fila en la página de la carga
+        return render_template(
+            "carga_masiva.html", tipos=list(GENERADORES_PDF), extensiones=EXTENSIONES_NOMINA, error=None,
+            **estado['resultado'],
+        )
+    return render_template("estado_trabajo.html", trabajo=estado)
+
+@app.route("/jobs/<id_trabajo>/pdf")
+def pdf_trabajo(id_trabajo):
+    """
+    Descarga el PDF generado por un trabajo terminado. Se busca por número de contrato en el
+    índice del almacén, así se encuentra aunque después se haya movido o archivado.
+    """
+    trabajo = cola_trabajos.obtener(id_trabajo)
+    numero = trabajo.resultado.get('contract_number') if trabajo is not None and 'pdf' in trabajo.resultado else None
+    respuesta = _respuesta_pdf_guardado(numero) if numero else None
+    if respuesta is None:
+        return "El PDF de este trabajo no está disponible.", 404
+    return respuesta
+
+
+# --- RUTAS PARA LA BANDEJA DE SALIDA DE CORREOS ---
+
+@app.route("/outbox")
+def bandeja_de_salida():
+    """Muestra los correos pendientes y fallidos de la bandeja de salida; con formato=json devuelve lo mismo en JSON."""
+    estado = {
+        'resumen': registro.resumen_correos(),
+        'pendientes': registro.listar_correos((CORREO_PENDIENTE, CORREO_ENVIANDO)),
+        'fallidos': registro.listar_correos((CORREO_FALLIDO,)),
+        'max_intentos': MAX_INTENTOS,
+    }
+    if request.args.get('formato') == 'json':
+        return jsonify(estado)
+    return render_template("bandeja_salida.html", **estado)
+
+@app.route("/outbox/<int:id_correo>/reintentar", methods=["POST"])
+def reintentar_correo(id_correo):
+    """Vuelve a encolar un correo fallido."""
+    if not registro.reintentar_correo(id_correo):
+        return f"No existe un correo fallido con id {id_correo}.", 404
+    bandeja_salida.iniciar()
+    return redirect("/outbox")
+
+
+# --- RUTA PARA DESCARGAR EL PDF DE UN CONTRATO ---
+
+def _respuesta_pdf_guardado(contract_number):
+    """PDF suelto o archivado de un contrato según el índice del almacén, o None si no tiene."""
+    ruta = almacen_pdfs.ubicar(contract_number)
+    if ruta is not None:
+        return send_file(ruta, mimetype="application/pdf", conditional=True, download_name=os.path.basename(ruta))
+    archivado = almacen_pdfs.leer_archivado(contract_number)
+    if archivado is not None:
+        nombre, contenido, sha256 = archivado
+        return send_file(io.BytesIO(contenido), mimetype="application/pdf", conditional=True,
+                         download_name=nombre, etag=sha256)
+    return None
+
+@app.route("/pdf/<contract_number>")
+def descargar_pdf(contract_number):
+    """
+    Devuelve el PDF de un contrato con Content-Length y soporte de descargas parciales (Range).
+    El archivo se ubica con el índice del almacén, suelto o dentro de un ZIP anual de
+    contratos archivados; si no está se genera de nuevo a partir de los datos del registro.
+    """
+    respuesta = _respuesta_pdf_guardado(contract_number)
+    if respuesta is not None:
+        return respuesta
+    contrato = registro.buscar_por_numero(contract_number)
+    if contrato is None:
+        return f"No existe un contrato con el número '{contract_number}'.", 404
+    if contrato.get('tipo_contrato') not in DEFINICIONES:
+        return f"No hay generador de PDF para el tipo de contrato '{contrato.get('tipo_contrato')}'.", 404
+    ruta = almacen_pdfs.obtener_ruta(contrato)
+    if ruta is None:
+        return "No se pudo generar el PDF del contrato.", 500
+    return send_file(ruta, mimetype="application/pdf", conditional=True, download_name=os.path.basename(ruta))
+
+
+# --- RUTA PARA DESCARGAR TODOS LOS CONTRATOS DE UN PROYECTO ---
+
+@app.route("/bundle")
+def paquete_contratos():
+    """
+    Devuelve todos los contratos de un proyecto en un solo PDF (formato=pdf, por defecto)
+    o en un ZIP con el PDF de cada uno (formato=zip), transmitidos por partes.
+
+    Parámetros: project (obligatorio) y, opcionales, desde y hasta (fecha de inicio,
+    AAAA-MM-DD) y tipo_contrato.
+    """
+    proyecto = request.args.get('project', '').strip()
+    if not proyecto:
+        return "Indique el proyecto con el parámetro 'project'.", 400
+    formato = request.args.get('formato', 'pdf')
+    if formato not in GENERADORES_PAQUETE:
+        return f"Formato no soportado: {formato}. Use pdf o zip.", 404
+    contratos = registro.iterar_contratos(
+        desde=request.args.get('desde'),
+        hasta=request.args.get('hasta'),
+        proyecto=proyecto,
+        tipo_contrato=request.args.get('tipo_contrato'),
+    )
+    # Se lee el primer contrato antes de responder para avisar si el filtro no encuentra ninguno
+    primero = next(contratos, None)
+    if primero is None:
+        return f"No hay contratos registrados para el proyecto '{proyecto}' con esos filtros.", 404
+    nombre_archivo = f"contratos_{secure_filename(proyecto) or 'proyecto'}.{formato}"
+    return Response(
+        GENERADORES_PAQUETE[formato](itertools.chain([primero], contratos)),
+        mimetype=FORMATOS_PAQUETE[formato],
+        headers={"Content-Disposition": f"attachment; filename={nombre_archivo}"},
+    )
 
 
 # --- RUTAS PARA PROCESAR FORMULARIOS Y CREAR LOS PDFs ---
 
+def generar_y_notificar(trabajo, datos, funcion_pdf):
+    """Trabajo en segundo plano: genera el PDF del contrato y envía el correo de notificación."""
+    trabajo.avanzar("Generando PDF")
+    contenido = funcion_pdf(datos, en_memoria=True)
+    if contenido is None:
+        raise RuntimeError("No se pudo generar el PDF del contrato.")
+    # El mismo contenido se guarda en disco y se adjunta al correo: el PDF se genera una sola vez
+    ruta = almacen_pdfs.guardar(DEFINICIONES[datos['tipo_contrato']], datos, contenido)
+    # /jobs/<id>?formato=json muestra el resultado: se publica el enlace de descarga, no la ruta
+    # del archivo en el servidor (/jobs/<id>/pdf lo ubica por número de contrato)
+    trabajo.resultado['pdf'] = f"/pdf/{quote(str(datos.get('contract_number', '')), safe='')}"
+
+    # El correo queda en la bandeja de salida; el envío a Gmail no retiene el trabajo
+    trabajo.avanzar("Encolando correo")
+    recipients = ["gtecnica@ingeurbanismo.com", "gestionhumana@ingeurbanismo.com"]
+    trabajo.resultado['correo'] = send_contract_email(datos, recipients, attachment=(os.path.basename(ruta), contenido))
+
 def procesar_y_guardar_contrato(datos, tipo_contrato, funcion_pdf):
-    """Función auxiliar para procesar datos, generar PDF y guardar en Excel."""
+    """
+    Función auxiliar para guardar en el registro y encolar la generación del PDF y la notificación.
+
+    Returns:
+        tuple: (id del trabajo, None) si el contrato se registró, o (None, mensaje de error).
+    """
     datos['tipo_contrato'] = tipo_contrato
-    
-    # Llama a la función específica para generar el PDF
-    funcion_pdf(datos)
 
-    # Guarda los datos en un archivo Excel específico para contratos laborales
-    excel_file = "contratos_lab.xlsx"
+    # Guarda los datos en el registro de contratos antes que nada: si el número ya existe,
+    # se rechaza sin gastar tiempo en el PDF ni en el correo.
     try:
-        df_excel = pd.read_excel(excel_file) if os.path.exists(excel_file) else pd.DataFrame()
-    except Exception as e:
-        print(f"Error al leer {excel_file}: {e}. Se creará uno nuevo.")
-        df_excel = pd.DataFrame()
-        
-    df_new_row = pd.DataFrame([datos])
-    df_final = pd.concat([df_excel, df_new_row], ignore_index=True)
-    df_final.to_excel(excel_file, index=False)
-    print(f"Contrato '{tipo_contrato}' guardado en {excel_file}")
-
-    # Enviar correo electrónico
-    recipients = ["gtecnica@ingeurbanismo.com", "gestionhumana@ingeurbanismo.com"]
-    send_contract_email(datos, recipients)
+        id_contrato = registro.insertar_contrato(datos)
+    except ContratoDuplicadoError as e:
+        print(f"Contrato '{tipo_contrato}' rechazado: {e}")
+        return None, str(e)
+    print(f"Contrato '{tipo_contrato}' guardado en {registro.db_file} (id {id_contrato})")
+
+    # El PDF y el correo se hacen en segundo plano: la respuesta no espera a ReportLab ni a Gmail
+    descripcion = f"{tipo_contrato} {datos.get('contract_number', '')} - {datos.get('contractor_name', '')}"
+    trabajo = cola_trabajos.encolar(
+        descripcion, generar_y_notificar, datos, funcion_pdf,
+        total_pasos=2, resultado={'contract_number': datos.get('contract_number', '')},
+    )
+    return trabajo.id, None
 
 @app.route("/create/obra-labor", methods=["POST"])
 def create_obra_labor():
     datos = request.form.to_dict()
     # Cuando tengas el generador real, cambia 'generar_pdf_temporal' por 'generar_pdf_obra_labor'
-    procesar_y_guardar_contrato(datos, "Obra o Labor", generar_pdf_obra_labor)
-    return redirect("/")
+    id_trabajo, error = procesar_y_guardar_contrato(datos, "Obra o Labor", generar_pdf_obra_labor)
+    if error:
+        return error, 409
+    return redirect(f"/jobs/{id_trabajo}")
 
 #@app.route("/create/prestacion-servicios", methods=["POST"])
 #def create_prestacion_servicios():
@@ -110,15 +365,19 @@ def create_obra_labor():
 def create_termino_fijo():
     datos = request.form.to_dict()
     # Cambia 'generar_pdf_temporal' por 'generar_pdf_termino_fijo'
-    procesar_y_guardar_contrato(datos, "Término Fijo", generar_pdf_termino_fijo)
-    return redirect("/")
+    id_trabajo, error = procesar_y_guardar_contrato(datos, "Término Fijo", generar_pdf_termino_fijo)
+    if error:
+        return error, 409
+    return redirect(f"/jobs/{id_trabajo}")
 
 @app.route("/create/termino-indefinido", methods=["POST"])
 def create_termino_indefinido():
     datos = request.form.to_dict()
     # Cambia 'generar_pdf_temporal' por 'generar_pdf_termino_indefinido'
-    procesar_y_guardar_contrato(datos, "Término Indefinido", generar_pdf_termino_indefinido)
-    return redirect("/")
+    id_trabajo, error = procesar_y_guardar_contrato(datos, "Término Indefinido", generar_pdf_termino_indefinido)
+    if error:
+        return error, 409
+    return redirect(f"/jobs/{id_trabajo}")
 
 #@app.route("/create/teletrabajo", methods=["POST"])
 #def create_teletrabajo():
@@ -129,4 +388,6 @@ def create_termino_indefinido():
 
 
 if __name__ == "__main__":
+    # Envía los correos que hayan quedado pendientes de una ejecución anterior
+    bandeja_salida.iniciar()
     app.run(debug=True)
\ No newline at end of file
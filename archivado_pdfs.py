@@ -0,0 +1,231 @@
+# archivado_pdfs.py
+# Archivo de los PDFs de contratos terminados hace tiempo.
+# Los contratos cuya estimated_end_date pasó hace más de N meses salen de las carpetas de
+# pdfs_laboral y se guardan, recomprimidos, en un ZIP por año de terminación:
+#   pdfs_laboral/archivados/contratos_2024.zip
+# El índice del registro (archivos_pdf) anota en qué ZIP quedó cada PDF; la app los sigue
+# sirviendo en /pdf/<numero> y en /bundle igual que a los sueltos (ver almacen_pdfs.py).
+#
+# Recompresión: ReportLab escribe cada stream comprimido con zlib y además codificado en
+# ASCII85 (texto), que ocupa un 25 % más. Al archivar se quita esa capa y los streams se
+# vuelven a comprimir con el nivel máximo de zlib. El contenido de las páginas no cambia.
+# Los contratos solo usan las fuentes estándar de PDF (Helvetica), que no van incrustadas,
+# así que no hay fuentes que recortar.
+#
+# Uso:
+#   python archivado_pdfs.py --meses 12             # archiva los terminados hace más de 12 meses
+#   python archivado_pdfs.py --meses 12 --simular   # solo informa cuánto se ahorraría
+
+import argparse
+import base64
+import calendar
+import hashlib
+import os
+import re
+import shutil
+import warnings
+import zipfile
+import zlib
+from collections import defaultdict
+from datetime import date
+
+from almacen_pdfs import almacen_pdfs
+
+# Carpeta (dentro de pdfs_laboral) con los ZIP anuales
+DIRECTORIO_ARCHIVADOS = "archivados"
+# Meses que deben pasar desde estimated_end_date para archivar un contrato
+MESES_POR_DEFECTO = 12
+NIVEL_COMPRESION = 9
+
+_INICIO_OBJETO = re.compile(rb'\s*(\d+) (\d+) obj\s*')
+_INICIO_STREAM = re.compile(rb'>>\s*stream\r?\n')
+# /Length directa; la indirecta ('/Length 12 0 R') no coincide, ni siquiera con parte de sus dígitos
+_LONGITUD = re.compile(rb'/Length (\d+)\b(?!\s+\d+\s+R)')
+_LONGITUD_INDIRECTA = re.compile(rb'/Length\s+\d+\s+\d+\s+R')
+_FILTRO = re.compile(rb'/Filter\s*(\[[^\]]*\]|/\w+)')
+
+
+def _recomprimir_stream(diccionario, datos, nivel):
+    """Devuelve el diccionario y los datos de un stream comprimidos con zlib, sin ASCII85."""
+    filtro = _FILTRO.search(diccionario)
+    filtros = re.findall(rb'/(\w+)', filtro.group(1)) if filtro else []
+    if filtros == [b'ASCII85Decode', b'FlateDecode']:
+        datos = datos.strip()
+        if datos.endswith(b'~>'):
+            datos = datos[:-2]
+        crudo = zlib.decompress(base64.a85decode(datos))
+    elif filtros == [b'FlateDecode']:
+        crudo = zlib.decompress(datos)
+    elif not filtros:
+        crudo = datos
+    else:
+        # Imágenes u otros filtros: se dejan como están
+        return diccionario, datos
+    comprimido = zlib.compress(crudo, nivel)
+    if filtro:
+        diccionario = _FILTRO.sub(b'/Filter /FlateDecode', diccionario, count=1)
+    else:
+        diccionario = diccionario[:-2].rstrip() + b' /Filter /FlateDecode\n>>'
+    diccionario = _LONGITUD.sub(b'/Length %d' % len(comprimido), diccionario, count=1)
+    return diccionario, comprimido
+
+
+def recomprimir_pdf(contenido, nivel=NIVEL_COMPRESION):
+    """
+    Reescribe un PDF generado por ReportLab con sus streams en zlib binario (sin ASCII85) y
+    con la tabla xref recalculada. Si el PDF no tiene la estructura esperada (un solo xref,
+    objetos numerados 1..N) se devuelve sin cambios.
+    """
+    primero = _INICIO_OBJETO.match(contenido, contenido.find(b'\n1 0 obj'))
+    inicio_xref = contenido.rfind(b'\nxref\n')
+    inicio_trailer = contenido.find(b'trailer', inicio_xref)
+    fin_trailer = contenido.find(b'startxref', inicio_trailer)
+    if primero is None or min(inicio_xref, inicio_trailer, fin_trailer) < 0:
+        return contenido
+
+    partes = [contenido[:primero.start() + 1]]  # encabezado %PDF y comentario binario
+    posicion_salida = len(partes[0])
+    desplazamientos = []
+    posicion = primero.start()
+    while posicion < inicio_xref:
+        objeto = _INICIO_OBJETO.match(contenido, posicion)
+        if objeto is None or int(objeto.group(1)) != len(desplazamientos) + 1 or objeto.group(2) != b'0':
+            return contenido
+        inicio_cuerpo = objeto.end()
+        fin = contenido.find(b'endobj', inicio_cuerpo)
+        stream = _INICIO_STREAM.search(contenido, inicio_cuerpo, fin)
+        if stream is None:
+            cuerpo = contenido[inicio_cuerpo:fin]
+        else:
+            diccionario = contenido[inicio_cuerpo:stream.start() + 2]
+            longitud = _LONGITUD.search(diccionario)
+            if longitud is not None:
+                inicio_datos = stream.end()
+                datos = contenido[inicio_datos:inicio_datos + int(longitud.group(1))]
+                fin = contenido.find(b'endobj', inicio_datos + len(datos))
+                diccionario, datos = _recomprimir_stream(diccionario, datos, nivel)
+                cuerpo = diccionario + b'\nstream\n' + datos + b'\nendstream\n'
+            elif _LONGITUD_INDIRECTA.search(diccionario):
+                # La longitud está en otro objeto: el stream se copia tal cual, sin recomprimir
+                fin_stream = contenido.find(b'endstream', stream.end())
+                fin = contenido.find(b'endobj', fin_stream) if fin_stream >= 0 else -1
+                cuerpo = contenido[inicio_cuerpo:fin]
+            else:
+                return contenido
+        if fin < 0:
+            return contenido
+        objeto_nuevo = b'%s 0 obj\n%s' % (objeto.group(1), cuerpo) + b'endobj\n'
+        desplazamientos.append(posicion_salida)
+        partes.append(objeto_nuevo)
+        posicion_salida += len(objeto_nuevo)
+        posicion = fin + len(b'endobj')
+
+    xref = [b'xref\n0 %d\n' % (len(desplazamientos) + 1), b'0000000000 65535 f \n']
+    xref.extend(b'%010d 00000 n \n' % desplazamiento for desplazamiento in desplazamientos)
+    partes.extend(xref)
+    partes.append(contenido[inicio_trailer:fin_trailer])
+    partes.append(b'startxref\n%d\n%%%%EOF\n' % posicion_salida)
+    return b''.join(partes)
+
+
+def _restar_meses(fecha, meses):
+    total = fecha.year * 12 + fecha.month - 1 - meses
+    anio, mes = divmod(total, 12)
+    return date(anio, mes + 1, min(fecha.day, calendar.monthrange(anio, mes + 1)[1]))
+
+
+def _borrar_carpetas_vacias(directorio_base, ruta):
+    """Borra las carpetas año/mes/tipo que quedaron vacías, sin subir más allá de pdfs_laboral."""
+    carpeta = os.path.dirname(ruta)
+    while os.path.normpath(carpeta) != os.path.normpath(directorio_base) and carpeta.startswith(directorio_base):
+        try:
+            os.rmdir(carpeta)
+        except OSError:
+            return
+        carpeta = os.path.dirname(carpeta)
+
+
+def _archivar_anio(almacen, anio, entradas, resumen, simular):
+    """Agrega al ZIP del año los PDFs dados, actualiza el índice y borra los archivos sueltos."""
+    relativo = f"{DIRECTORIO_ARCHIVADOS}/contratos_{anio}.zip"
+    ruta_zip = almacen.ruta_absoluta(relativo)
+    temporal = f"{ruta_zip}.{os.getpid()}.tmp"
+    if not simular:
+        os.makedirs(os.path.dirname(ruta_zip), exist_ok=True)
+        # Se trabaja sobre una copia: quien esté leyendo el ZIP nunca lo ve a medio escribir
+        if os.path.exists(ruta_zip):
+            shutil.copyfile(ruta_zip, temporal)
+    archivados, sueltos = [], []
+    try:
+        archivo_zip = None if simular else zipfile.ZipFile(
+            temporal, 'a', compression=zipfile.ZIP_DEFLATED, compresslevel=NIVEL_COMPRESION
+        )
+        for entrada in entradas:
+            ruta = almacen.ruta_absoluta(entrada['ruta'])
+            try:
+                with open(ruta, 'rb') as f:
+                    contenido = f.read()
+            except FileNotFoundError:
+                print(f"Advertencia: falta {entrada['ruta']} ({entrada['contract_number']}); no se archiva.")
+                continue
+            recomprimido = recomprimir_pdf(contenido)
+            sha256 = hashlib.sha256(recomprimido).hexdigest()
+            resumen['contratos'] += 1
+            resumen['bytes_antes'] += len(contenido)
+            resumen['bytes_despues'] += len(recomprimido)
+            if archivo_zip is not None:
+                ya_archivado = entrada['ruta'] in archivo_zip.NameToInfo and \
+                    hashlib.sha256(archivo_zip.read(entrada['ruta'])).hexdigest() == sha256
+                if not ya_archivado:
+                    with warnings.catch_warnings():
+                        # Un PDF regenerado después de archivarlo se agrega de nuevo; al leer gana el último
+                        warnings.simplefilter('ignore', UserWarning)
+                        archivo_zip.writestr(entrada['ruta'], recomprimido)
+            archivados.append((entrada['contract_number'], relativo, len(recomprimido), sha256))
+            sueltos.append(ruta)
+        if archivo_zip is not None:
+            archivo_zip.close()
+            os.replace(temporal, ruta_zip)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    if simular or not archivados:
+        return
+    almacen.registro.marcar_pdfs_archivados(archivados)
+    for ruta in sueltos:
+        os.remove(ruta)
+        _borrar_carpetas_vacias(almacen.directorio, ruta)
+    print(f"{len(archivados)} contratos archivados en {relativo}")
+
+
+def archivar(meses=MESES_POR_DEFECTO, hoy=None, simular=False, almacen=almacen_pdfs):
+    """
+    Archiva los PDFs de los contratos cuya estimated_end_date pasó hace más de `meses` meses.
+
+    Returns:
+        dict: contratos archivados, ZIPs tocados y bytes de los PDFs antes y después de recomprimirlos
+        (sin contar la compresión del ZIP).
+    """
+    fecha_limite = _restar_meses(hoy or date.today(), meses)
+    por_anio = defaultdict(list)
+    for entrada in almacen.registro.pdfs_para_archivar(fecha_limite.isoformat()):
+        por_anio[entrada['estimated_end_date'][:4]].append(entrada)
+    resumen = {'contratos': 0, 'archivos_zip': len(por_anio), 'bytes_antes': 0, 'bytes_despues': 0}
+    for anio, entradas in sorted(por_anio.items()):
+        _archivar_anio(almacen, anio, entradas, resumen, simular)
+    return resumen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Archiva en ZIPs anuales los PDFs de contratos terminados hace tiempo.")
+    parser.add_argument('--meses', type=int, default=MESES_POR_DEFECTO,
+                        help="Meses desde estimated_end_date a partir de los cuales se archiva (por defecto 12)")
+    parser.add_argument('--simular', action='store_true', help="Solo informar qué se archivaría y cuánto se ahorraría")
+    args = parser.parse_args()
+
+    resumen = archivar(args.meses, simular=args.simular)
+    antes, despues = resumen['bytes_antes'], resumen['bytes_despues']
+    ahorro = f" ({(despues - antes) / antes:+.0%})" if antes else ""
+    accion = "se archivarían" if args.simular else "archivados"
+    print(f"{resumen['contratos']} contratos {accion} en {resumen['archivos_zip']} archivos anuales; "
+          f"PDFs: {antes / 1024:.0f} KB -> {despues / 1024:.0f} KB{ahorro}.")
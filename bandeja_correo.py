@@ -0,0 +1,176 @@
+# bandeja_correo.py
+# Bandeja de salida de los correos de notificación y de alertas.
+# send_contract_email y send_alert_email ya no hablan con el servidor SMTP: guardan el mensaje
+# completo en la tabla correos_salientes del registro y vuelven de inmediato. Un hilo en
+# segundo plano, que arranca la aplicación web, vacía la bandeja (los scripts usan vaciar()):
+#   - limita el ritmo de envío (MENSAJES_POR_MINUTO) para no chocar con los límites de Gmail;
+#   - si un envío falla, lo reintenta más tarde con espera exponencial (1 min, 2, 4, ... hasta 1 h);
+#   - tras MAX_INTENTOS fallos el correo queda 'fallido' y se ve en /outbox, desde donde se
+#     puede volver a encolar.
+# Como la bandeja vive en la base, un correo no se pierde si Gmail está caído o si la
+# aplicación se reinicia: el siguiente proceso que la vacíe lo envía.
+
+import email
+import json
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from email.utils import getaddresses
+
+from registro_contratos import registro
+from transporte_correo import transporte_correo
+
+# Intentos de envío antes de dar un correo por fallido
+MAX_INTENTOS = 6
+# Espera antes del primer reintento; se duplica con cada fallo
+ESPERA_INICIAL_REINTENTO = 60
+ESPERA_MAXIMA_REINTENTO = 3600
+# Ritmo máximo de envío
+MENSAJES_POR_MINUTO = 30
+# Correos que se toman de la base en cada ronda
+CORREOS_POR_RONDA = 20
+# Segundos entre revisiones de la bandeja cuando no llega ningún correo nuevo
+SEGUNDOS_ENTRE_REVISIONES = 15
+# Un correo que lleva más que esto en 'enviando' se considera abandonado y se vuelve a tomar
+MINUTOS_RECLAMO_VENCIDO = 10
+
+
+def espera_reintento(intentos):
+    """Segundos hasta el siguiente intento de un correo que ya falló `intentos` veces."""
+    return min(ESPERA_INICIAL_REINTENTO * 2 ** (intentos - 1), ESPERA_MAXIMA_REINTENTO)
+
+
+class BandejaSalida:
+    """Encola correos en el registro y los envía desde un hilo en segundo plano."""
+
+    def __init__(self, registro=registro, transporte=transporte_correo, mensajes_por_minuto=MENSAJES_POR_MINUTO,
+                 segundo_plano=True):
+        self.registro = registro
+        self.transporte = transporte
+        self.mensajes_por_minuto = mensajes_por_minuto
+        # Sin hilo en segundo plano los correos solo salen al llamar a procesar() o vaciar()
+        self.segundo_plano = segundo_plano
+        self._ultimo_envio = float('-inf')
+        self._aviso = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def encolar(self, mensaje, tipo):
+        """Guarda un mensaje (email.message.Message con From, To y Subject) y devuelve su id en la bandeja."""
+        return self.encolar_varios([mensaje], tipo)[0]
+
+    def encolar_varios(self, mensajes, tipo):
+        """Guarda varios mensajes en una sola operación del registro (todos o ninguno) y devuelve sus ids."""
+        ids = self.registro.encolar_correos([
+            (tipo, mensaje['Subject'], [direccion for _, direccion in getaddresses(mensaje.get_all('To', []))],
+             mensaje.as_bytes())
+            for mensaje in mensajes
+        ])
+        # No se arranca el hilo aquí: solo lo inicia la aplicación web. Un script (alert_checker.py,
+        # carga_masiva.py) termina enseguida y mataría el hilo a mitad de un envío; esos envían con vaciar()
+        self._aviso.set()
+        return ids
+
+    def iniciar(self):
+        """Arranca el hilo que vacía la bandeja (una sola vez por proceso) y le avisa que revise la bandeja."""
+        if not self.segundo_plano:
+            return
+        if self._hilo is None:
+            with self._lock:
+                if self._hilo is None:
+                    self._detener.clear()
+                    hilo = threading.Thread(target=self._bucle, name="bandeja-correo", daemon=True)
+                    hilo.start()
+                    self._hilo = hilo
+        self._aviso.set()
+
+    def detener(self):
+        """Detiene el hilo en segundo plano, esperando a que termine la ronda que esté enviando."""
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is None:
+            return
+        self._detener.set()
+        self._aviso.set()
+        hilo.join()
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            # El aviso se borra antes de revisar: un correo encolado durante la ronda la repite
+            self._aviso.clear()
+            try:
+                enviados = self.procesar()
+            except Exception as e:
+                print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+                print(f"Error al procesar la bandeja de salida: {e}")
+                print(traceback.format_exc())
+                print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+                enviados = 0
+            if not enviados and not self._detener.is_set():
+                self._aviso.wait(SEGUNDOS_ENTRE_REVISIONES)
+
+    def _esperar_turno(self):
+        """Respeta el ritmo máximo de envío."""
+        if not self.mensajes_por_minuto:
+            return
+        # Cada envío reserva su turno con el lock tomado; la espera se hace fuera de él
+        with self._lock:
+            turno = max(self._ultimo_envio + 60 / self.mensajes_por_minuto, time.monotonic())
+            self._ultimo_envio = turno
+        espera = turno - time.monotonic()
+        if espera > 0:
+            time.sleep(espera)
+
+    def procesar(self):
+        """Envía una ronda de correos pendientes por una misma conexión. Devuelve cuántos tomó."""
+        reclamo_vencido = (datetime.now() - timedelta(minutes=MINUTOS_RECLAMO_VENCIDO)).isoformat(timespec='seconds')
+        correos = self.registro.reclamar_correos(CORREOS_POR_RONDA, reclamo_vencido)
+        with self.transporte.sesion():
+            for correo in correos:
+                self._esperar_turno()
+                try:
+                    self.transporte.enviar(email.message_from_bytes(correo['mensaje']))
+                except Exception as e:
+                    self._fallo(correo, e)
+                else:
+                    self.registro.registrar_envio_correo(correo['id'])
+                    print(f"✅ Correo {correo['id']} ({correo['tipo']}) enviado a {', '.join(json.loads(correo['destinatarios']))}")
+        return len(correos)
+
+    def _fallo(self, correo, error):
+        intentos = correo['intentos'] + 1
+        if intentos >= MAX_INTENTOS:
+            self.registro.registrar_envio_correo(correo['id'], error=error)
+            print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            print(f"El correo {correo['id']} ('{correo['asunto']}') falló {intentos} veces y queda como fallido: {error}")
+            print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            return
+        proximo = datetime.now() + timedelta(seconds=espera_reintento(intentos))
+        self.registro.registrar_envio_correo(correo['id'], error=error, proximo_intento=proximo.isoformat(timespec='seconds'))
+        print(f"Error al enviar el correo {correo['id']} (intento {intentos} de {MAX_INTENTOS}): {error}. "
+              f"Se reintenta a las {proximo:%H:%M:%S}.")
+
+    def vaciar(self, tiempo_maximo=None):
+        """
+        Envía desde este hilo los correos pendientes hasta que no quede ninguno listo para
+        enviar. Lo usan los scripts (alert_checker.py, carga_masiva.py) antes de terminar,
+        ya que el hilo en segundo plano muere con el proceso. Si el hilo estaba corriendo se
+        detiene primero y se espera su ronda en curso, así ningún correo queda a medio enviar
+        en 'enviando'. Devuelve cuántos procesó.
+        """
+        self.detener()
+        limite = None if tiempo_maximo is None else time.monotonic() + tiempo_maximo
+        total = 0
+        with self.transporte.sesion():
+            while limite is None or time.monotonic() < limite:
+                procesados = self.procesar()
+                if not procesados:
+                    break
+                total += procesados
+        return total
+
+
+# Bandeja compartida por la aplicación, la carga masiva y el verificador de alertas
+bandeja_salida = BandejaSalida()
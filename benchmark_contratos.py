@@ -0,0 +1,333 @@
+# benchmark_contratos.py
+# Pruebas de rendimiento de los generadores de PDF y del envío de formularios.
+#
+# Escenarios:
+#   - generador/<tipo>/<datos>: cada generar_pdf_* con datos cortos (los de ejemplo de
+#     email_sender.py) y con textos muy largos que obligan a partir párrafos y páginas.
+#   - registro_<n>/...: el envío de un formulario (procesar_y_guardar_contrato: registro,
+#     cola, PDF y correo) con un registro que ya tiene n contratos, más la búsqueda por
+#     número y la primera página de la lista.
+# De cada escenario se informa la latencia p50/p95, páginas por segundo, bytes por PDF y
+# el pico de memoria (RSS) del proceso hasta ese momento.
+#
+# Todo corre en un directorio temporal (registro, caché y pdfs_laboral propios) y sin
+# enviar correos, así no toca los datos reales.
+#
+# Uso:
+#   python benchmark_contratos.py --guardar-base          # mide y guarda la línea base
+#   python benchmark_contratos.py                         # mide y compara con la línea base
+#   python benchmark_contratos.py --tamanos 100 10000 --repeticiones 10
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows: no se informa el pico de memoria
+    resource = None
+
+import app_laboral
+from email_sender import DATOS_EJEMPLO
+from registro_contratos import RegistroContratos
+from trabajos import TERMINADO
+from almacen_pdfs import almacen_pdfs
+from pdf_generators_lab import motor_pdf
+from pdf_generators_lab.cache_pdf import CachePDF
+from pdf_generators_lab.tipos_contrato import GENERADORES_PDF
+
+ARCHIVO_BASE = "benchmark_base.json"
+TAMANOS_REGISTRO = (100, 10_000, 100_000)
+# PDFs que se generan por tipo de contrato y juego de datos
+REPETICIONES_GENERADOR = 20
+# Formularios que se envían con cada tamaño de registro
+ENVIOS_POR_REGISTRO = 20
+# Consultas de búsqueda y de lista con cada tamaño de registro
+CONSULTAS_POR_REGISTRO = 50
+# Filas que se insertan en cada transacción al llenar el registro de prueba
+FILAS_POR_CARGA = 5000
+# Diferencia relativa con la línea base a partir de la cual se marca una regresión
+TOLERANCIA = 0.15
+
+# Campos que se alargan en los datos "largos" y cuántas veces se repite su texto
+CAMPOS_LARGOS = (
+    'contractor_name', 'employer_address', 'contractor_address', 'workers_position',
+    'activity', 'final_time', 'project_name', 'salary',
+)
+REPETICIONES_TEXTO_LARGO = 25
+
+# Métricas comparadas con la línea base: (clave, True si más alto es mejor)
+METRICAS_COMPARADAS = (
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('paginas_por_s', True),
+    ('bytes_por_pdf', False),
+    ('rss_pico_mb', False),
+)
+
+
+def juegos_de_datos():
+    """Datos fijos de los generadores: 'corto' (el ejemplo de email_sender) y 'largo'."""
+    largo = dict(DATOS_EJEMPLO)
+    for campo in CAMPOS_LARGOS:
+        largo[campo] = " ".join([DATOS_EJEMPLO[campo]] * REPETICIONES_TEXTO_LARGO)
+    return {'corto': dict(DATOS_EJEMPLO), 'largo': largo}
+
+
+def contar_paginas(contenido):
+    return len(re.findall(rb"/Type /Page\b", contenido))
+
+
+def rss_pico_mb():
+    """Pico de memoria residente del proceso, en MB (None si la plataforma no lo informa)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo informa en KB y macOS en bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _percentil(valores, p):
+    """Percentil p (0-100) por rango más cercano."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def _resumen(tiempos, paginas=0, bytes_salida=0):
+    resumen = {
+        'operaciones': len(tiempos),
+        'p50_ms': round(_percentil(tiempos, 50) * 1000, 3),
+        'p95_ms': round(_percentil(tiempos, 95) * 1000, 3),
+    }
+    if paginas:
+        resumen['paginas_por_s'] = round(paginas / sum(tiempos), 1)
+        resumen['bytes_por_pdf'] = round(bytes_salida / len(tiempos))
+    resumen['rss_pico_mb'] = rss_pico_mb()
+    return resumen
+
+
+@contextlib.contextmanager
+def _entorno_aislado():
+    """
+    Dirige la caché de PDFs y pdfs_laboral a un directorio temporal y desactiva el envío de
+    correos; al salir restaura todo y borra el directorio.
+    """
+    directorio = tempfile.mkdtemp(prefix="benchmark_contratos_")
+    originales = (almacen_pdfs.directorio, almacen_pdfs.registro, motor_pdf.cache_pdfs,
+                  app_laboral.send_contract_email, app_laboral.registro)
+    almacen_pdfs.directorio = os.path.join(directorio, "pdfs_laboral")
+    motor_pdf.cache_pdfs = CachePDF(os.path.join(directorio, "cache_pdfs"))
+    app_laboral.send_contract_email = lambda *args, **kwargs: None
+    try:
+        yield directorio
+    finally:
+        (almacen_pdfs.directorio, almacen_pdfs.registro, motor_pdf.cache_pdfs,
+         app_laboral.send_contract_email, app_laboral.registro) = originales
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def medir_generadores(repeticiones=REPETICIONES_GENERADOR):
+    """
+    Mide cada generar_pdf_* con cada juego de datos. Cada PDF lleva un número de contrato
+    distinto, así ninguno sale de la caché: se mide la generación completa. Antes se genera
+    uno sin medirlo, para no contar la compilación de la definición, que se hace una vez.
+    """
+    resultados = {}
+    for tipo, generador in GENERADORES_PDF.items():
+        for nombre_datos, datos in juegos_de_datos().items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                generador(dict(datos, tipo_contrato=tipo, contract_number="BENCH-inicial"), en_memoria=True)
+            tiempos, paginas, bytes_salida = [], 0, 0
+            for i in range(repeticiones):
+                datos_pdf = dict(datos, tipo_contrato=tipo, contract_number=f"BENCH-{i}")
+                inicio = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    contenido = generador(datos_pdf, en_memoria=True)
+                tiempos.append(time.perf_counter() - inicio)
+                if contenido is None:
+                    raise RuntimeError(f"El generador de '{tipo}' no pudo generar el PDF.")
+                paginas += contar_paginas(contenido)
+                bytes_salida += len(contenido)
+            resultados[f"generador/{tipo}/{nombre_datos}"] = _resumen(tiempos, paginas, bytes_salida)
+    return resultados
+
+
+def _filas_registro(tamano):
+    """Contratos de relleno para el registro de prueba, por bloques de FILAS_POR_CARGA."""
+    tipos = list(GENERADORES_PDF)
+    inicio = date(2024, 1, 1)
+    bloque = []
+    for i in range(tamano):
+        bloque.append(dict(
+            DATOS_EJEMPLO,
+            tipo_contrato=tipos[i % len(tipos)],
+            contract_number=f"REG-{i}",
+            contractor_id=str(10_000_000 + i),
+            contractor_name=f"Trabajador {i}",
+            project_name=f"Proyecto {i % 50}",
+            start_date=(inicio + timedelta(days=i % 700)).isoformat(),
+            estimated_end_date=(inicio + timedelta(days=i % 700 + 180)).isoformat(),
+        ))
+        if len(bloque) >= FILAS_POR_CARGA:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def medir_registro(tamano, directorio, envios=ENVIOS_POR_REGISTRO, consultas=CONSULTAS_POR_REGISTRO):
+    """
+    Llena un registro temporal con `tamano` contratos y mide sobre él el envío de
+    formularios (respuesta y trabajo completo), la búsqueda por número y la lista.
+    """
+    db_file = os.path.join(directorio, f"registro_{tamano}.db")
+    registro = RegistroContratos(db_file=db_file, excel_file=os.path.join(directorio, "sin_excel.xlsx"))
+    app_laboral.registro = almacen_pdfs.registro = registro
+    prefijo = f"registro_{tamano}"
+    resultados = {}
+
+    inicio_carga = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for bloque in _filas_registro(tamano):
+            registro.insertar_contratos(bloque)
+    print(f"  Registro de {tamano} contratos cargado en {time.perf_counter() - inicio_carga:.1f} s")
+
+    tipos = list(GENERADORES_PDF)
+    respuestas, completos, paginas, bytes_salida = [], [], 0, 0
+    for i in range(envios):
+        tipo = tipos[i % len(tipos)]
+        datos = dict(DATOS_EJEMPLO, contract_number=f"ENVIO-{tamano}-{i}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            id_trabajo, error = app_laboral.procesar_y_guardar_contrato(datos, tipo, GENERADORES_PDF[tipo])
+            respuestas.append(time.perf_counter() - inicio)
+            if error:
+                raise RuntimeError(error)
+            trabajo = app_laboral.cola_trabajos.obtener(id_trabajo)
+            while not trabajo.finalizado:
+                time.sleep(0.0005)
+            completos.append(time.perf_counter() - inicio)
+        if trabajo.estado != TERMINADO:
+            raise RuntimeError(f"El trabajo {id_trabajo} terminó con error: {trabajo.error}")
+        with open(trabajo.resultado['pdf'], 'rb') as f:
+            contenido = f.read()
+        paginas += contar_paginas(contenido)
+        bytes_salida += len(contenido)
+    resultados[f"{prefijo}/envio"] = _resumen(respuestas)
+    resultados[f"{prefijo}/envio_completo"] = _resumen(completos, paginas, bytes_salida)
+
+    tiempos = []
+    for i in range(consultas):
+        inicio = time.perf_counter()
+        registro.buscar_por_numero(f"REG-{(i * 7919) % tamano}")
+        tiempos.append(time.perf_counter() - inicio)
+    resultados[f"{prefijo}/busqueda"] = _resumen(tiempos)
+
+    registro.consultar_contratos()  # la primera consulta arma la vista del registro
+    tiempos = []
+    for _ in range(consultas):
+        inicio = time.perf_counter()
+        registro.consultar_contratos()
+        tiempos.append(time.perf_counter() - inicio)
+    resultados[f"{prefijo}/lista"] = _resumen(tiempos)
+
+    # Evita que la instantánea pendiente se escriba cuando el directorio ya no existe
+    if registro._temporizador_instantanea is not None:
+        registro._temporizador_instantanea.cancel()
+    return resultados
+
+
+def comparar(resultados, base, tolerancia=TOLERANCIA, metricas_comparadas=METRICAS_COMPARADAS):
+    """
+    Imprime cada métrica junto a la de la línea base y devuelve la lista de regresiones
+    (las métricas que empeoraron más que la tolerancia).
+    """
+    regresiones = []
+    for escenario, metricas in resultados.items():
+        anteriores = base.get(escenario)
+        if anteriores is None:
+            print(f"{escenario}: sin línea base")
+            continue
+        partes = []
+        for metrica, mayor_es_mejor in metricas_comparadas:
+            actual, anterior = metricas.get(metrica), anteriores.get(metrica)
+            if actual is None or not anterior:
+                continue
+            cambio = (actual - anterior) / anterior
+            empeoro = -cambio > tolerancia if mayor_es_mejor else cambio > tolerancia
+            partes.append(f"{metrica} {anterior} -> {actual} ({cambio:+.0%}){' ⚠️' if empeoro else ''}")
+            if empeoro:
+                regresiones.append(f"{escenario} {metrica}: {anterior} -> {actual} ({cambio:+.0%})")
+        print(f"{escenario}: " + "; ".join(partes))
+    return regresiones
+
+
+def _imprimir(resultados):
+    for escenario, metricas in resultados.items():
+        print(f"{escenario}: " + ", ".join(f"{clave}={valor}" for clave, valor in metricas.items()))
+
+
+def informar(resultados, ruta_base, guardar_base=False, tolerancia=TOLERANCIA, metricas_comparadas=METRICAS_COMPARADAS):
+    """
+    Imprime los resultados y los guarda como línea base o los compara con la guardada.
+    Devuelve False si hubo regresiones.
+    """
+    _imprimir(resultados)
+    if guardar_base:
+        with open(ruta_base, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'escenarios': resultados,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"Línea base guardada en {ruta_base}")
+    elif os.path.exists(ruta_base):
+        with open(ruta_base, encoding='utf-8') as f:
+            base = json.load(f)
+        print(f"\nComparación con la línea base del {base['fecha']} ({base['plataforma']}):")
+        regresiones = comparar(resultados, base['escenarios'], tolerancia, metricas_comparadas)
+        if regresiones:
+            print(f"\n⚠️ {len(regresiones)} regresiones de rendimiento:")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            return False
+        print("\nSin regresiones de rendimiento.")
+    else:
+        print(f"No existe la línea base {ruta_base}; guárdela con --guardar-base.")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento de los generadores de PDF y del envío de formularios.")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=list(TAMANOS_REGISTRO),
+                        help="Tamaños de registro a probar (por defecto 100 10000 100000)")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES_GENERADOR,
+                        help="PDFs por tipo de contrato y juego de datos")
+    parser.add_argument('--envios', type=int, default=ENVIOS_POR_REGISTRO,
+                        help="Formularios enviados con cada tamaño de registro")
+    parser.add_argument('--base', default=ARCHIVO_BASE, help="Archivo JSON de la línea base")
+    parser.add_argument('--guardar-base', action='store_true', help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="Empeoramiento relativo tolerado antes de marcar una regresión (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    resultados = {}
+    with _entorno_aislado() as directorio:
+        print("Generadores de PDF...")
+        resultados.update(medir_generadores(args.repeticiones))
+        for tamano in args.tamanos:
+            print(f"Envío de formularios con {tamano} contratos registrados...")
+            resultados.update(medir_registro(tamano, directorio, args.envios))
+    if not informar(resultados, args.base, args.guardar_base, args.tolerancia):
+        sys.exit(1)
@@ -0,0 +1,198 @@
+# benchmark_correo.py
+# Pruebas de rendimiento del envío de correos, sin Gmail: todo se envía a un servidor SMTP
+# local de prueba (servidor_smtp_local.py) que corre dentro del mismo proceso.
+#
+# Escenarios (N mensajes cada uno, 2000 por defecto):
+#   - transporte/sin_pool: una conexión SMTP nueva por mensaje, como se enviaba antes.
+#   - transporte/pool: los mensajes por el pool de conexiones de transporte_correo.py.
+#   - bandeja/<contrato|alerta>/encolar: send_contract_email (con el PDF adjunto) o
+#     send_alert_email guardando el correo en la bandeja de salida (lo que espera la petición).
+#   - bandeja/<contrato|alerta>/entrega: la bandeja enviando esos correos al servidor.
+# De cada escenario se informa mensajes por segundo, latencia p50/p95 (en los que se mide
+# mensaje a mensaje), conexiones SMTP abiertas, bytes por mensaje y el pico de memoria.
+#
+# La bandeja usa un registro temporal y no tiene límite de ritmo, así se mide el envío y no la espera.
+#
+# Uso:
+#   python benchmark_correo.py --guardar-base      # mide y guarda la línea base
+#   python benchmark_correo.py                     # mide y compara con la línea base
+#   python benchmark_correo.py --mensajes 5000
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import email_sender
+from email_sender import DATOS_EJEMPLO
+from bandeja_correo import BandejaSalida
+from benchmark_contratos import _percentil, informar, rss_pico_mb, TOLERANCIA
+from registro_contratos import RegistroContratos
+from servidor_smtp_local import ServidorSMTPLocal
+from transporte_correo import TransporteSMTP
+
+ARCHIVO_BASE = "benchmark_correo_base.json"
+MENSAJES = 2000
+# Tamaño del PDF adjunto a los correos de contrato (similar al de un contrato de Obra o Labor)
+TAMANO_ADJUNTO = 18 * 1024
+DESTINATARIOS = ["gtecnica@example.com", "gestionhumana@example.com"]
+REMITENTE = "benchmark@localhost"
+# Segundos que se espera a que el servidor reciba todos los mensajes de un escenario
+TIEMPO_MAXIMO_ENTREGA = 600
+
+# Métricas comparadas con la línea base: (clave, True si más alto es mejor)
+METRICAS_COMPARADAS = (
+    ('mensajes_por_s', True),
+    ('p50_ms', False),
+    ('p95_ms', False),
+    ('conexiones', False),
+    ('bytes_por_mensaje', False),
+    ('rss_pico_mb', False),
+)
+
+
+def adjunto_prueba():
+    """Contenido fijo con el tamaño de un PDF de contrato (no hace falta que sea un PDF válido)."""
+    return (b"%PDF-1.4\n" + bytes(range(256)) * (TAMANO_ADJUNTO // 256))[:TAMANO_ADJUNTO]
+
+
+def mensaje_prueba(i, adjunto):
+    message = MIMEMultipart("mixed")
+    message["From"] = REMITENTE
+    message["To"] = ", ".join(DESTINATARIOS)
+    message["Subject"] = f"Mensaje de prueba {i}"
+    message.attach(MIMEText(f"<b>Mensaje de prueba {i}</b>", "html"))
+    part = MIMEApplication(adjunto, _subtype="pdf")
+    part.add_header("Content-Disposition", "attachment", filename=f"prueba_{i}.pdf")
+    message.attach(part)
+    return message
+
+
+def _resumen(segundos, mensajes, servidor, tiempos=None):
+    resumen = {
+        'mensajes': mensajes,
+        'mensajes_por_s': round(mensajes / segundos, 1),
+    }
+    if tiempos:
+        resumen['p50_ms'] = round(_percentil(tiempos, 50) * 1000, 3)
+        resumen['p95_ms'] = round(_percentil(tiempos, 95) * 1000, 3)
+    if servidor is not None:
+        resumen['conexiones'] = servidor.conexiones
+        resumen['bytes_por_mensaje'] = round(servidor.bytes_recibidos / max(servidor.mensajes, 1))
+    resumen['rss_pico_mb'] = rss_pico_mb()
+    return resumen
+
+
+def medir_transporte(servidor, mensajes, con_pool):
+    """Envía `mensajes` mensajes directamente por el transporte, con o sin pool de conexiones."""
+    transporte = TransporteSMTP(servidor.host, servidor.port, ssl=False, usuario=REMITENTE, contrasena="prueba",
+                                max_inactivas=2 if con_pool else 0)
+    adjunto = adjunto_prueba()
+    servidor.reiniciar_contadores()
+    tiempos = []
+    inicio = time.perf_counter()
+    for i in range(mensajes):
+        mensaje = mensaje_prueba(i, adjunto)
+        inicio_mensaje = time.perf_counter()
+        transporte.enviar(mensaje)
+        tiempos.append(time.perf_counter() - inicio_mensaje)
+    servidor.esperar_mensajes(mensajes, TIEMPO_MAXIMO_ENTREGA)
+    total = time.perf_counter() - inicio
+    transporte.cerrar()
+    return _resumen(total, mensajes, servidor, tiempos)
+
+
+@contextlib.contextmanager
+def _bandeja_aislada(servidor, directorio):
+    """
+    Bandeja de salida con un registro temporal, apuntando al servidor local, en lugar de la
+    que usa email_sender; las credenciales del entorno se reemplazan por unas de prueba.
+    """
+    registro = RegistroContratos(db_file=os.path.join(directorio, "bandeja.db"),
+                                 excel_file=os.path.join(directorio, "sin_excel.xlsx"))
+    transporte = TransporteSMTP(servidor.host, servidor.port, ssl=False, usuario=REMITENTE, contrasena="prueba")
+    bandeja = BandejaSalida(registro, transporte, mensajes_por_minuto=0, segundo_plano=False)
+    variables = {"GMAIL_SENDER_EMAIL": REMITENTE, "GMAIL_APP_PASSWORD": "prueba"}
+    entorno_original = {clave: os.environ.get(clave) for clave in variables}
+    bandeja_original = email_sender.bandeja_salida
+    os.environ.update(variables)
+    email_sender.bandeja_salida = bandeja
+    try:
+        yield bandeja
+    finally:
+        email_sender.bandeja_salida = bandeja_original
+        for clave, valor in entorno_original.items():
+            if valor is None:
+                os.environ.pop(clave, None)
+            else:
+                os.environ[clave] = valor
+        transporte.cerrar()
+
+
+def medir_bandeja(servidor, directorio, mensajes, tipo):
+    """Encola `mensajes` correos de contrato o de alerta y luego mide su entrega desde la bandeja."""
+    resultados = {}
+    adjunto = adjunto_prueba()
+    directorio = os.path.join(directorio, tipo)
+    os.makedirs(directorio, exist_ok=True)
+    with _bandeja_aislada(servidor, directorio) as bandeja:
+        tiempos = []
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(mensajes):
+                datos = dict(DATOS_EJEMPLO, contract_number=f"CORREO-{i}")
+                inicio_mensaje = time.perf_counter()
+                if tipo == 'contrato':
+                    id_correo = email_sender.send_contract_email(datos, DESTINATARIOS, attachment=(f"contrato_{i}.pdf", adjunto))
+                else:
+                    id_correo = email_sender.send_alert_email(datos, DESTINATARIOS, 30)
+                tiempos.append(time.perf_counter() - inicio_mensaje)
+                if id_correo is None:
+                    raise RuntimeError(f"No se pudo encolar el correo de {tipo} {i}.")
+        resultados[f"bandeja/{tipo}/encolar"] = _resumen(time.perf_counter() - inicio, mensajes, None, tiempos)
+
+        servidor.reiniciar_contadores()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            bandeja.vaciar()
+        if not servidor.esperar_mensajes(mensajes, TIEMPO_MAXIMO_ENTREGA):
+            raise RuntimeError(f"El servidor recibió {servidor.mensajes} de {mensajes} correos de {tipo}.")
+        resultados[f"bandeja/{tipo}/entrega"] = _resumen(time.perf_counter() - inicio, mensajes, servidor)
+        pendientes = bandeja.registro.resumen_correos()
+        if pendientes['enviado'] != mensajes:
+            raise RuntimeError(f"La bandeja no quedó vacía: {pendientes}")
+    return resultados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del envío de correos contra un servidor SMTP local.")
+    parser.add_argument('--mensajes', type=int, default=MENSAJES, help="Mensajes por escenario (por defecto 2000)")
+    parser.add_argument('--base', default=ARCHIVO_BASE, help="Archivo JSON de la línea base")
+    parser.add_argument('--guardar-base', action='store_true', help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="Empeoramiento relativo tolerado antes de marcar una regresión (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    resultados = {}
+    directorio = tempfile.mkdtemp(prefix="benchmark_correo_")
+    try:
+        with ServidorSMTPLocal() as servidor:
+            print(f"Servidor SMTP de prueba en {servidor.host}:{servidor.port}")
+            print("Transporte sin pool de conexiones...")
+            resultados["transporte/sin_pool"] = medir_transporte(servidor, args.mensajes, con_pool=False)
+            print("Transporte con pool de conexiones...")
+            resultados["transporte/pool"] = medir_transporte(servidor, args.mensajes, con_pool=True)
+            for tipo in ('contrato', 'alerta'):
+                print(f"Bandeja de salida con correos de {tipo}...")
+                resultados.update(medir_bandeja(servidor, directorio, args.mensajes, tipo))
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    if not informar(resultados, args.base, args.guardar_base, args.tolerancia, METRICAS_COMPARADAS):
+        sys.exit(1)
@@ -0,0 +1,205 @@
+# carga_masiva.py
+# Generación de contratos en lote a partir de una nómina (CSV o XLSX).
+# Cada fila de la nómina es un contrato, con columnas iguales a los campos de los formularios
+# (contract_number, contractor_name, start_date, ...). La columna 'tipo_contrato' es opcional:
+# si falta o está vacía se usa el tipo indicado para toda la carga.
+#
+# Flujo: se validan todas las filas antes de escribir nada; si alguna tiene errores no se
+# registra ningún contrato. Si todas son válidas se guardan en el registro en una sola
+# transacción y los PDFs se generan en paralelo, un proceso por núcleo.
+
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import pandas as pd
+
+from pdf_generators_lab.tipos_contrato import GENERADORES_PDF, CAMPOS_OBLIGATORIOS, DEFINICIONES
+from email_sender import send_contract_email
+from bandeja_correo import bandeja_salida
+from registro_contratos import registro, ContratoDuplicadoError
+from almacen_pdfs import almacen_pdfs
+
+EXTENSIONES_NOMINA = ('.csv', '.xlsx')
+# Campos de fecha: deben venir como AAAA-MM-DD, igual que en los formularios
+CAMPOS_FECHA = ('contract_date', 'date_birth', 'start_date', 'estimated_end_date')
+DESTINATARIOS = ["gtecnica@ingeurbanismo.com", "gestionhumana@ingeurbanismo.com"]
+MENSAJE_OMITIDO = "No se registró: la nómina tiene filas con errores."
+# Pasos que informa procesar_nomina a la cola de trabajos
+PASOS_CARGA = 4
+
+
+def leer_nomina(archivo, nombre_archivo=None):
+    """
+    Lee la nómina y devuelve una lista de diccionarios, uno por fila, con todos los
+    valores como texto. `archivo` puede ser una ruta o un archivo abierto (p. ej. una subida).
+    """
+    nombre_archivo = nombre_archivo or str(archivo)
+    extension = os.path.splitext(nombre_archivo)[1].lower()
+    if extension == '.csv':
+        df = pd.read_csv(archivo, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    elif extension == '.xlsx':
+        df = pd.read_excel(archivo, dtype=str, keep_default_na=False)
+    else:
+        raise ValueError(f"Formato de nómina no soportado: '{extension}'. Use CSV o XLSX.")
+    df.columns = [str(col).strip() for col in df.columns]
+    filas = []
+    for fila in df.to_dict(orient="records"):
+        datos = {col: str(valor).strip() for col, valor in fila.items() if str(valor).strip()}
+        for campo in CAMPOS_FECHA:
+            # Las celdas de fecha de Excel llegan como 'AAAA-MM-DD 00:00:00'
+            if campo in datos and datos[campo].endswith(' 00:00:00'):
+                datos[campo] = datos[campo][:-len(' 00:00:00')]
+        filas.append(datos)
+    return filas
+
+
+def _resultado(numero_fila, datos, estado, mensaje, pdf=None):
+    return {
+        'fila': numero_fila,
+        'contract_number': datos.get('contract_number', ''),
+        'contractor_name': datos.get('contractor_name', ''),
+        'tipo_contrato': datos.get('tipo_contrato', ''),
+        'estado': estado,
+        'mensaje': mensaje,
+        'pdf': pdf,
+    }
+
+
+def validar_fila(datos):
+    """Devuelve la lista de errores de una fila (vacía si es válida)."""
+    tipo = datos.get('tipo_contrato')
+    if tipo not in GENERADORES_PDF:
+        return [f"Tipo de contrato desconocido: '{tipo}'. Tipos válidos: {', '.join(GENERADORES_PDF)}."]
+    errores = []
+    faltantes = [campo for campo in ['contract_number'] + CAMPOS_OBLIGATORIOS[tipo] if not datos.get(campo)]
+    if faltantes:
+        errores.append(f"Faltan campos obligatorios: {', '.join(dict.fromkeys(faltantes))}.")
+    for campo in CAMPOS_FECHA:
+        if datos.get(campo):
+            try:
+                datetime.strptime(datos[campo], '%Y-%m-%d')
+            except ValueError:
+                errores.append(f"Fecha inválida en {campo}: '{datos[campo]}' (use AAAA-MM-DD).")
+    return errores
+
+
+def validar_nomina(filas, tipo_por_defecto):
+    """
+    Completa el tipo de contrato de cada fila y valida la nómina completa, incluidos los
+    números de contrato repetidos dentro del archivo o ya registrados.
+
+    Returns:
+        list: Un resultado por fila, con estado 'valido' o 'error'.
+    """
+    resultados = []
+    vistos = {}
+    for numero_fila, datos in enumerate(filas, start=2):  # la fila 1 es el encabezado
+        datos.setdefault('tipo_contrato', tipo_por_defecto)
+        errores = validar_fila(datos)
+        numero = datos.get('contract_number')
+        if numero:
+            clave = numero.casefold()
+            if clave in vistos:
+                errores.append(f"Número de contrato repetido en la fila {vistos[clave]}.")
+            else:
+                vistos[clave] = numero_fila
+                if registro.existe_contrato(numero):
+                    errores.append(f"Ya existe un contrato registrado con el número '{numero}'.")
+        if errores:
+            resultados.append(_resultado(numero_fila, datos, 'error', " ".join(errores)))
+        else:
+            resultados.append(_resultado(numero_fila, datos, 'valido', "Fila válida."))
+    return resultados
+
+
+def _generar_pdf(tipo_contrato, datos):
+    # Se ejecuta en los procesos del pool: debe ser una función de módulo para poder enviarse.
+    # Devuelve el contenido; el proceso principal lo guarda en el almacén y en su índice.
+    return GENERADORES_PDF[tipo_contrato](datos, en_memoria=True)
+
+
+def procesar_nomina(filas, tipo_por_defecto="Obra o Labor", procesos=None, enviar_correos=True, avanzar=None):
+    """
+    Valida, registra y genera los contratos de una nómina.
+
+    Args:
+        filas (list): Diccionarios con los datos de cada contrato (ver leer_nomina).
+        tipo_por_defecto (str): Tipo de contrato de las filas sin 'tipo_contrato'.
+        procesos (int): Procesos para generar los PDFs (por defecto, uno por núcleo).
+        enviar_correos (bool): Enviar el correo de notificación de cada contrato.
+        avanzar (callable): Opcional, recibe el nombre de cada paso (p. ej. Trabajo.avanzar);
+            son PASOS_CARGA pasos.
+
+    Returns:
+        list: Un resultado por fila ('ok', 'error' u 'omitido') con su mensaje y la ruta del PDF.
+    """
+    avanzar = avanzar or (lambda paso: None)
+    avanzar("Validando nómina")
+    resultados = validar_nomina(filas, tipo_por_defecto)
+    if not resultados:
+        return resultados
+    if any(r['estado'] == 'error' for r in resultados):
+        for r in resultados:
+            if r['estado'] == 'valido':
+                r['estado'] = 'omitido'
+                r['mensaje'] = MENSAJE_OMITIDO
+        return resultados
+
+    # Todos los contratos en una transacción: o se registran todos o ninguno
+    avanzar("Registrando contratos")
+    try:
+        ids = registro.insertar_contratos(filas)
+    except ContratoDuplicadoError as e:
+        # Otro usuario registró el mismo número entre la validación y la inserción
+        for r in resultados:
+            duplicado = r['contract_number'].casefold() == str(e.numero_contrato).casefold()
+            r['estado'] = 'error' if duplicado else 'omitido'
+            r['mensaje'] = str(e) if duplicado else MENSAJE_OMITIDO
+        return resultados
+    print(f"Carga masiva: {len(ids)} contratos guardados en {registro.db_file}")
+
+    avanzar(f"Generando {len(filas)} PDFs")
+    # 'spawn' y no 'fork': la aplicación web tiene hilos (escritor del registro, trabajos, bandeja)
+    # y un proceso hijo creado con fork podría heredar un lock tomado por alguno y bloquearse
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context('spawn')) as pool:
+        contenidos = list(pool.map(_generar_pdf, [d['tipo_contrato'] for d in filas], filas, chunksize=4))
+        rutas = [
+            None if contenido is None else almacen_pdfs.guardar(DEFINICIONES[datos['tipo_contrato']], datos, contenido)
+            for datos, contenido in zip(filas, contenidos)
+        ]
+
+    avanzar("Encolando correos" if enviar_correos else "Guardando resultados")
+    for resultado, datos, id_contrato, ruta, contenido in zip(resultados, filas, ids, rutas, contenidos):
+        if ruta is None:
+            resultado['estado'] = 'error'
+            resultado['mensaje'] = f"Registrado (id {id_contrato}), pero no se pudo generar el PDF."
+            continue
+        resultado['estado'] = 'ok'
+        resultado['mensaje'] = f"Registrado (id {id_contrato}) y PDF generado."
+        resultado['pdf'] = ruta
+        if enviar_correos:
+            # Se adjunta el mismo PDF que devolvió el proceso, sin volver a leerlo del disco
+            send_contract_email(datos, DESTINATARIOS, attachment=(os.path.basename(ruta), contenido))
+    return resultados
+
+
+if __name__ == '__main__':
+    # Uso: python carga_masiva.py nomina.xlsx --tipo "Término Fijo" [--procesos 4] [--sin-correo]
+    parser = argparse.ArgumentParser(description="Genera contratos en lote a partir de una nómina CSV o XLSX.")
+    parser.add_argument('nomina', help="Ruta del archivo CSV o XLSX")
+    parser.add_argument('--tipo', default="Obra o Labor", choices=list(GENERADORES_PDF),
+                        help="Tipo de contrato para las filas sin columna tipo_contrato")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos para generar los PDFs (por defecto, uno por núcleo)")
+    parser.add_argument('--sin-correo', action='store_true', help="No enviar los correos de notificación")
+    args = parser.parse_args()
+
+    resultados = procesar_nomina(leer_nomina(args.nomina), args.tipo, args.procesos, not args.sin_correo)
+    for r in resultados:
+        print(f"Fila {r['fila']:>4} | {r['estado']:<7} | {r['contract_number']} {r['contractor_name']}: {r['mensaje']}")
+    correctos = sum(r['estado'] == 'ok' for r in resultados)
+    print(f"Carga masiva terminada: {correctos} de {len(resultados)} contratos generados.")
+    if not args.sin_correo:
+        # Los correos quedaron en la bandeja de salida: se envían antes de terminar
+        bandeja_salida.vaciar()
@@ -1,15 +1,86 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
 import os
+from urllib.parse import quote
+from jinja2 import Environment, FileSystemLoader
 
-def send_contract_email(contract_data: dict, recipients: list):
+from bandeja_correo import bandeja_salida
+
+# Plantillas de los cuerpos de correo (templates/correos). Se compilan la primera vez que se
+# usan y el entorno las conserva compiladas; auto_reload=False evita revisar el archivo en cada correo.
+DIRECTORIO_PLANTILLAS_CORREO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "correos")
+_plantillas_correo = Environment(
+    loader=FileSystemLoader(DIRECTORIO_PLANTILLAS_CORREO),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+# Adjuntos más grandes que esto se recomprimen y, si aún no caben, se reemplazan por un enlace
+# (Gmail admite 25 MB por correo, contando la codificación base64 del adjunto)
+TAMANO_MAXIMO_ADJUNTO = 10 * 1024 * 1024
+# Dirección de la aplicación para los enlaces de descarga de los PDFs que no se adjuntan
+URL_APLICACION = os.getenv("URL_APLICACION", "http://127.0.0.1:5000")
+
+# Campos del contrato que se listan en el correo de notificación: (etiqueta, campo)
+CAMPOS_CORREO_CONTRATO = (
+    ('Número de Contrato', 'contract_number'),
+    ('Fecha del Contrato', 'contract_date'),
+    ('Nombre del Empleador', 'employer_name'),
+    ('Nombre del Trabajador', 'contractor_name'),
+    ('Cédula del Trabajador', 'contractor_id'),
+    ('Lugar Nacimiento', 'city_birth'),
+    ('Fecha Nacimiento', 'date_birth'),
+    ('Dirección del Trabajador', 'contractor_address'),
+    ('Teléfono del Trabajador', 'contractor_phone'),
+    ('Email del Trabajador', 'contractor_email'),
+    ('Cargo del Trabajador', 'workers_position'),
+    ('Actividad a Realizar', 'activity'),
+    ('Duración de la Obra', 'final_time'),
+    ('Fecha de Inicio', 'start_date'),
+    ('Fecha Final Estimada', 'estimated_end_date'),
+    ('Nombre del Proyecto o Centro de Costos', 'project_name'),
+    ('Lugar de Ejecución', 'project_city'),
+    ('Salario Mensual', 'salary'),
+    ('Frecuencia de Pago', 'payment_frequency'),
+)
+
+def _renderizar(plantilla, **contexto):
+    return _plantillas_correo.get_template(plantilla).render(**contexto)
+
+def _preparar_adjunto(contract_data, attachment):
+    """
+    Devuelve (adjunto, enlace): el PDF tal cual si cabe; recomprimido si así cabe; o None y el
+    enlace de descarga en /pdf/<numero> si ni así cabe.
     """
-    Envía un correo electrónico con los datos del contrato generado.
+    filename, content = attachment
+    if len(content) <= TAMANO_MAXIMO_ADJUNTO:
+        return attachment, None
+    from archivado_pdfs import recomprimir_pdf
+    content = recomprimir_pdf(content)
+    if len(content) <= TAMANO_MAXIMO_ADJUNTO:
+        return (filename, content), None
+    numero = contract_data.get('contract_number')
+    enlace = f"{URL_APLICACION}/pdf/{quote(str(numero), safe='')}" if numero else None
+    print(f"Advertencia: el PDF {filename} ({len(content) / 1024 / 1024:.1f} MB) supera el máximo de adjunto; se envía un enlace.")
+    return None, enlace
+
+def send_contract_email(contract_data: dict, recipients: list, attachment: tuple = None):
+    """
+    Envía un correo electrónico con los datos del contrato generado. El correo se guarda en
+    la bandeja de salida y se envía en segundo plano.
 
     Args:
         contract_data (dict): Un diccionario con los datos del contrato.
         recipients (list): Una lista de direcciones de correo electrónico de los destinatarios.
+        attachment (tuple): Opcional, (nombre_archivo, contenido) del PDF a adjuntar. El contenido
+            son los bytes que acaba de generar el motor de PDFs, sin volver a leerlos del disco.
+            Si supera TAMANO_MAXIMO_ADJUNTO se recomprime o, si aún no cabe, se envía un enlace.
+
+    Returns:
+        int: El id del correo en la bandeja de salida, o None si no se pudo encolar.
     """
     sender_email = os.getenv("GMAIL_SENDER_EMAIL")
     sender_app_password = os.getenv("GMAIL_APP_PASSWORD")
@@ -28,50 +99,40 @@ def send_contract_email(contract_data: dict, recipients: list):
 
     subject = f"Nuevo Contrato Laboral Generado: {tipo_contrato} - {nombre_trabajador}"
 
-    # Construir el cuerpo del correo con las 23 variables
-    body = f"""
-    Estimados,
-
-    Se ha generado un nuevo CONTRATO LABORAL con los siguientes detalles:
-
-    <b>Número de Contrato:</b> {contract_data.get('contract_number', '')}<br/>
-    <b>Fecha del Contrato:</b> {contract_data.get('contract_date', '')}<br/>
-    <b>Nombre del Empleador:</b> {contract_data.get('employer_name', '')}<br/>
-    <b>Nombre del Trabajador:</b> {contract_data.get('contractor_name', '')}<br/>
-    <b>Cédula del Trabajador:</b> {contract_data.get('contractor_id', '')}<br/>
-    <b>Lugar Nacimiento:</b> {contract_data.get('city_birth', '')}<br/>
-    <b>Fecha Nacimiento:</b> {contract_data.get('date_birth', '')}<br/>
-    <b>Dirección del Trabajador:</b> {contract_data.get('contractor_address', '')}<br/>
-    <b>Teléfono del Trabajador:</b> {contract_data.get('contractor_phone', '')}<br/>
-    <b>Email del Trabajador:</b> {contract_data.get('contractor_email', '')}<br/>
-    <b>Cargo del Trabajador:</b> {contract_data.get('workers_position', '')}<br/>
-    <b>Actividad a Realizar:</b> {contract_data.get('activity', '')}<br/>
-    <b>Duración de la Obra:</b> {contract_data.get('final_time', '')}<br/>
-    <b>Fecha de Inicio:</b> {contract_data.get('start_date', '')}<br/>
-    <b>Fecha Final Estimada:</b> {contract_data.get('estimated_end_date', '')}<br/>
-    <b>Nombre del Proyecto o Centro de Costos:</b> {contract_data.get('project_name', '')}<br/>
-    <b>Lugar de Ejecución:</b> {contract_data.get('project_city', '')}<br/>
-    <b>Salario Mensual:</b> {contract_data.get('salary', '')}<br/>
-    <b>Frecuencia de Pago:</b> {contract_data.get('payment_frequency', '')}<br/>
-
-    Por favor Gerente Tecnico confirmar la informaciòn al correo electronico de gestionhumana@ingeurbanismo.com,
-.
-    """
+    link = None
+    if attachment:
+        attachment, link = _preparar_adjunto(contract_data, attachment)
 
-    message = MIMEMultipart("alternative")
+    # El cuerpo sale de la plantilla compilada templates/correos/contrato.html
+    body = _renderizar(
+        "contrato.html",
+        contrato=contract_data,
+        campos=CAMPOS_CORREO_CONTRATO,
+        adjunto=attachment[0] if attachment else None,
+        enlace=link,
+    )
+
+    # Con adjunto el mensaje es "mixed" (cuerpo + archivo); sin él basta con "alternative"
+    message = MIMEMultipart("mixed" if attachment else "alternative")
     message["From"] = sender_email
     message["To"] = ", ".join(recipients)
     message["Subject"] = subject
     message.attach(MIMEText(body, "html"))
+    if attachment:
+        filename, content = attachment
+        part = MIMEApplication(content, _subtype="pdf")
+        part.add_header("Content-Disposition", "attachment", filename=filename)
+        message.attach(part)
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server: # Use 465 for SSL or 587 for TLS
-            server.login(sender_email, sender_app_password)
-            server.sendmail(sender_email, recipients, message.as_string())
-        print(f"✅ Correo enviado exitosamente a {', '.join(recipients)}")
+        # El correo se guarda en la bandeja de salida y lo envía un hilo aparte, con
+        # reintentos si Gmail falla (ver bandeja_correo.py)
+        id_correo = bandeja_salida.encolar(message, 'contrato')
+        print(f"📨 Correo {id_correo} en la bandeja de salida para {', '.join(recipients)}")
+        return id_correo
     except Exception as e:
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-        print(f"Error al enviar el correo electrónico: {e}")
+        print(f"Error al guardar el correo electrónico en la bandeja de salida: {e}")
         import traceback
         print(traceback.format_exc())
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
@@ -84,6 +145,9 @@ def send_alert_email(contract_data: dict, recipients: list, days_remaining: int)
         contract_data (dict): Un diccionario con los datos del contrato.
         recipients (list): Una lista de direcciones de correo electrónico de los destinatarios.
         days_remaining (int): Número de días restantes para el vencimiento.
+
+    Returns:
+        int: El id del correo en la bandeja de salida, o None si no se pudo encolar.
     """
     sender_email = os.getenv("GMAIL_SENDER_EMAIL")
     sender_app_password = os.getenv("GMAIL_APP_PASSWORD")
@@ -98,27 +162,13 @@ def send_alert_email(contract_data: dict, recipients: list, days_remaining: int)
 
     subject = f"ALERTA: Contrato {numero_contrato} de {nombre_trabajador} vence en {days_remaining} días."
 
-    body = f"""
-    Estimados,
-
-    Se informa que el contrato laboral del trabajador <b>{nombre_trabajador}</b> (C.C. {contract_data.get('contractor_id', '')}) 
-    con número de contrato <b>{numero_contrato}</b> tiene una fecha final estimada de <b>{contract_data.get('estimated_end_date', '')}</b>. 
-    Faltan aproximadamente <b>{days_remaining} días</b> para su vencimiento.
-
-    Detalles del contrato:
-    <ul>
-        <li><b>Tipo de Contrato:</b> {contract_data.get('tipo_contrato', '')}</li>
-        <li><b>Fecha de Inicio:</b> {contract_data.get('start_date', '')}</li>
-        <li><b>Cargo:</b> {contract_data.get('workers_position', '')}</li>
-        <li><b>Nombre del Proyecto:</b> {contract_data.get('project_name', '')}</li>
-        <li><b>Salario:</b> {contract_data.get('salary', '')}</li>
-    </ul>
-
-    Por favor, tomar las acciones correspondientes.
-
-    Saludos cordiales,
-    Su sistema de automatización de contratos.
-    """
+    body = _renderizar(
+        "alerta.html",
+        contrato=contract_data,
+        nombre_trabajador=nombre_trabajador,
+        numero_contrato=numero_contrato,
+        dias=days_remaining,
+    )
 
     message = MIMEMultipart("alternative")
     message["From"] = sender_email
@@ -127,46 +177,111 @@ def send_alert_email(contract_data: dict, recipients: list, days_remaining: int)
     message.attach(MIMEText(body, "html"))
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, sender_app_password)
-            server.sendmail(sender_email, recipients, message.as_string())
-        print(f"✅ Correo de ALERTA enviado exitosamente a {', '.join(recipients)}")
+        id_correo = bandeja_salida.encolar(message, 'alerta')
+        print(f"📨 Correo de ALERTA {id_correo} en la bandeja de salida para {', '.join(recipients)}")
+        return id_correo
+    except Exception as e:
+        print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+        print(f"Error al guardar el correo de alerta en la bandeja de salida: {e}")
+        import traceback
+        print(traceback.format_exc())
+        print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+
+def _agrupar_alertas(alertas):
+    """Ordena las alertas por proyecto y días restantes y las agrupa por proyecto."""
+    grupos = {}
+    for contract_data, days_remaining in sorted(
+        alertas, key=lambda a: (str(a[0].get('project_name') or ''), a[1], str(a[0].get('contract_number') or ''))
+    ):
+        grupos.setdefault(contract_data.get('project_name') or 'Sin proyecto', []).append((contract_data, days_remaining))
+    return grupos
+
+def send_alert_digest(alertas: list, recipients: list):
+    """
+    Envía un único correo de alerta por destinatario con todos los contratos próximos a vencer,
+    en una tabla agrupada por proyecto y ordenada por días restantes.
+
+    Args:
+        alertas (list): Tuplas (contract_data, days_remaining), una por contrato.
+        recipients (list): Una lista de direcciones de correo electrónico de los destinatarios.
+
+    Returns:
+        list: Los ids de los correos en la bandeja de salida (uno por destinatario), o None si
+        no se pudieron encolar; se encolan todos juntos, así en ese caso no queda ninguno.
+    """
+    sender_email = os.getenv("GMAIL_SENDER_EMAIL")
+    sender_app_password = os.getenv("GMAIL_APP_PASSWORD")
+
+    if not sender_email or not sender_app_password:
+        print("Advertencia: Las credenciales de Gmail no están configuradas en las variables de entorno para la alerta.")
+        print("Asegúrate de establecer GMAIL_SENDER_EMAIL y GMAIL_APP_PASSWORD.")
+        return None
+    if not alertas:
+        return []
+
+    dias = [days_remaining for _, days_remaining in alertas]
+    subject = f"ALERTA: {len(alertas)} contratos vencen en los próximos {max(dias)} días (el primero en {min(dias)} días)."
+
+    body = _renderizar("resumen_alertas.html", total=len(alertas), grupos=_agrupar_alertas(alertas))
+
+    # Un correo por destinatario: cada uno recibe el resumen completo una sola vez
+    messages = []
+    for recipient in recipients:
+        message = MIMEMultipart("alternative")
+        message["From"] = sender_email
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.attach(MIMEText(body, "html"))
+        messages.append(message)
+    # Todos los destinatarios en una sola transacción: si falla uno no queda ninguno encolado y
+    # alert_checker.py no marca los contratos, que se vuelven a incluir en la siguiente ejecución
+    try:
+        ids = bandeja_salida.encolar_varios(messages, 'alerta_resumen')
     except Exception as e:
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-        print(f"Error al enviar el correo de alerta: {e}")
+        print(f"Error al guardar el resumen de alertas en la bandeja de salida: {e}")
         import traceback
         print(traceback.format_exc())
         print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+        return None
+    for recipient in recipients:
+        print(f"📨 Resumen de ALERTAS ({len(alertas)} contratos) en la bandeja de salida para {recipient}")
+    return ids
+
+# Contrato de ejemplo: lo usan la prueba de abajo y benchmark_contratos.py
+DATOS_EJEMPLO = {
+    'tipo_contrato': 'Obra o Labor',
+    'contract_number': '001',
+    'contract_date': '2023-10-26',
+    'employer_name': 'Ejemplo S.A.S.',
+    'employer_nit': '123.456.789-0',
+    'legal_representative': 'Juan Pérez',
+    'legal_representative_id': '100.200.300',
+    'employer_address': 'Calle Ficticia 123',
+    'contractor_name': 'María García',
+    'contractor_id': '98.765.432',
+    'city_birth': 'Bogotá',
+    'date_birth': '1990-01-15',
+    'contractor_address': 'Avenida Imaginaria 456',
+    'contractor_phone': '3001112233',
+    'contractor_email': 'maria.garcia@example.com',
+    'name_number_emergency': 'Pedro García - 3004445566',
+    'workers_position': 'Asistente Administrativo',
+    'activity': 'Soporte administrativo y gestión documental.',
+    'final_time': 'Hasta la finalización del proyecto X.',
+    'start_date': '2023-11-01',
+    'estimated_end_date': '2024-12-31',
+    'project_name': 'Proyecto Alpha',
+    'project_city': 'Medellín',
+    'salary': 'DOS MILLONES DE PESOS M/CTE ($2.000.000)',
+    'payment_frequency': 'Mensual',
+}
 
 if __name__ == '__main__':
     # Ejemplo de uso para probar la función (esto no se ejecutará en la app principal)
-    example_data = {
-        'tipo_contrato': 'Obra o Labor',
-        'contract_number': '001',
-        'contract_date': '2023-10-26',
-        'employer_name': 'Ejemplo S.A.S.',
-        'employer_nit': '123.456.789-0',
-        'legal_representative': 'Juan Pérez',
-        'legal_representative_id': '100.200.300',
-        'employer_address': 'Calle Ficticia 123',
-        'contractor_name': 'María García',
-        'contractor_id': '98.765.432',
-        'city_birth': 'Bogotá',
-        'date_birth': '1990-01-15',
-        'contractor_address': 'Avenida Imaginaria 456',
-        'contractor_phone': '3001112233',
-        'contractor_email': 'maria.garcia@example.com',
-        'name_number_emergency': 'Pedro García - 3004445566',
-        'workers_position': 'Asistente Administrativo',
-        'activity': 'Soporte administrativo y gestión documental.',
-        'final_time': 'Hasta la finalización del proyecto X.',
-        'start_date': '2023-11-01',
-        'estimated_end_date': '2024-12-31',
-        'project_name': 'Proyecto Alpha',
-        'project_city': 'Medellín',
-        'salary': 'DOS MILLONES DE PESOS M/CTE ($2.000.000)',
-        'payment_frequency': 'Mensual',
-    }
+    # Para probar sin Gmail, inicie `python servidor_smtp_local.py` y defina SMTP_HOST=127.0.0.1,
+    # SMTP_PORT=2525 y SMTP_SSL=0; benchmark_correo.py mide el envío de miles de correos contra ese servidor.
+    example_data = dict(DATOS_EJEMPLO)
     # recipients_list = ["gtecnica@ingeurbanismo.com", "gestionhumana@ingeurbanismo.com"]
     # send_contract_email(example_data, recipients_list)
     # send_alert_email(example_data, ["gestionhumana@ingeurbanismo.com"], 40)
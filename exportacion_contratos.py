@@ -0,0 +1,92 @@
+# exportacion_contratos.py
+# Formatos de exportación del registro de contratos (CSV, XLSX y JSONL).
+# Todos consumen los contratos de un iterador y producen la salida por partes, así el
+# tamaño del registro no determina la memoria usada.
+
+import csv
+import io
+import json
+import os
+import tempfile
+from openpyxl import Workbook
+
+FORMATOS_EXPORTACION = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+# Filas que se acumulan antes de entregar un bloque de CSV o JSONL
+FILAS_POR_BLOQUE = 200
+# Tamaño de los bloques en que se transmite el archivo XLSX ya escrito
+BYTES_POR_BLOQUE = 64 * 1024
+
+
+def _valor(valor):
+    """Convierte valores ausentes en celdas vacías."""
+    return '' if valor is None else valor
+
+
+def generar_csv(columnas, contratos):
+    """Genera el CSV por bloques. Empieza con BOM para que Excel reconozca las tildes."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write('﻿')
+    escritor.writerow(columnas)
+    for i, contrato in enumerate(contratos, start=1):
+        escritor.writerow([_valor(contrato.get(col)) for col in columnas])
+        if i % FILAS_POR_BLOQUE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def generar_jsonl(columnas, contratos):
+    """Genera un objeto JSON por línea, con las claves en el orden de las columnas."""
+    bloque = []
+    for contrato in contratos:
+        bloque.append(json.dumps({col: contrato.get(col) for col in columnas}, ensure_ascii=False))
+        if len(bloque) >= FILAS_POR_BLOQUE:
+            yield "\n".join(bloque) + "\n"
+            bloque = []
+    if bloque:
+        yield "\n".join(bloque) + "\n"
+
+
+def escribir_xlsx(destino, columnas, contratos):
+    """
+    Escribe el libro con openpyxl en modo write_only: las filas van directo al archivo
+    en lugar de construir la hoja completa en memoria. Devuelve el número de contratos.
+    """
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Contratos")
+    hoja.append(columnas)
+    total = 0
+    for contrato in contratos:
+        hoja.append([_valor(contrato.get(col)) for col in columnas])
+        total += 1
+    libro.save(destino)
+    return total
+
+
+def generar_xlsx(columnas, contratos):
+    """Escribe el XLSX en un archivo temporal y lo transmite por bloques, borrándolo al final."""
+    descriptor, ruta_temporal = tempfile.mkstemp(suffix=".xlsx")
+    os.close(descriptor)
+    try:
+        escribir_xlsx(ruta_temporal, columnas, contratos)
+        with open(ruta_temporal, 'rb') as f:
+            while True:
+                bloque = f.read(BYTES_POR_BLOQUE)
+                if not bloque:
+                    break
+                yield bloque
+    finally:
+        os.remove(ruta_temporal)
+
+
+GENERADORES = {
+    'csv': generar_csv,
+    'xlsx': generar_xlsx,
+    'jsonl': generar_jsonl,
+}
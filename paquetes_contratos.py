@@ -0,0 +1,132 @@
+# paquetes_contratos.py
+# Paquetes con todos los contratos de un proyecto (para las jornadas de firma en obra).
+# Dos formatos:
+#   - pdf: un solo PDF con los contratos uno tras otro. Se dibujan en un mismo canvas, así
+#     las fuentes y el texto fijo de las cláusulas (form XObjects) se guardan una vez por
+#     tipo de contrato y no una vez por contrato.
+#   - zip: los PDFs del almacén (sueltos o archivados) empaquetados al vuelo, sin armar el ZIP en memoria.
+# Los contratos se leen del registro con un iterador y la salida se transmite por bloques.
+
+import os
+import tempfile
+import zipfile
+from reportlab.pdfgen import canvas
+
+from pdf_generators_lab.tipos_contrato import DEFINICIONES
+from pdf_generators_lab.motor_pdf import dibujar_contrato
+from almacen_pdfs import almacen_pdfs
+from exportacion_contratos import BYTES_POR_BLOQUE
+
+FORMATOS_PAQUETE = {
+    'pdf': 'application/pdf',
+    'zip': 'application/zip',
+}
+
+
+def _omitido(contrato, motivo):
+    print(f"Paquete: se omite el contrato '{contrato.get('contract_number')}': {motivo}")
+
+
+def escribir_pdf_combinado(destino, contratos):
+    """
+    Dibuja los contratos en un único PDF, con un marcador por contrato para saltar entre
+    ellos desde el lector. Devuelve el número de contratos incluidos.
+    """
+    c = canvas.Canvas(destino)
+    c.setTitle("Contratos laborales")
+    total = 0
+    for contrato in contratos:
+        definicion = DEFINICIONES.get(contrato.get('tipo_contrato'))
+        if definicion is None:
+            _omitido(contrato, f"no hay generador de PDF para el tipo '{contrato.get('tipo_contrato')}'.")
+            continue
+        total += 1
+        marcador = f"contrato_{total}"
+        c.bookmarkPage(marcador)
+        c.addOutlineEntry(f"{contrato.get('contract_number', '')} - {contrato.get('contractor_name', '')}", marcador)
+        dibujar_contrato(c, definicion, contrato, usar_formas=True)
+        c.showPage()
+    c.save()
+    return total
+
+
+def generar_pdf_combinado(contratos):
+    """Escribe el PDF combinado en un archivo temporal y lo transmite por bloques, borrándolo al final."""
+    descriptor, ruta_temporal = tempfile.mkstemp(suffix=".pdf")
+    os.close(descriptor)
+    try:
+        escribir_pdf_combinado(ruta_temporal, contratos)
+        with open(ruta_temporal, 'rb') as f:
+            while True:
+                bloque = f.read(BYTES_POR_BLOQUE)
+                if not bloque:
+                    break
+                yield bloque
+    finally:
+        os.remove(ruta_temporal)
+
+
+class _SalidaPorBloques:
+    """
+    Destino de escritura para zipfile que solo acumula lo escrito hasta que se retira.
+    No admite seek, así zipfile escribe los tamaños de cada archivo después de su contenido
+    y el ZIP puede transmitirse mientras se arma.
+    """
+
+    def __init__(self):
+        self._bloques = []
+        self._posicion = 0
+
+    def write(self, datos):
+        self._bloques.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        """Devuelve (y olvida) los bloques escritos desde la última vez."""
+        bloques, self._bloques = self._bloques, []
+        return bloques
+
+
+def generar_zip(contratos):
+    """
+    Genera un ZIP con el PDF de cada contrato, entregándolo por bloques. Los PDFs ya vienen
+    comprimidos, así que se guardan sin volver a comprimirlos (ZIP_STORED).
+    """
+    salida = _SalidaPorBloques()
+    nombres = set()
+    with zipfile.ZipFile(salida, 'w', compression=zipfile.ZIP_STORED) as archivo_zip:
+        for contrato in contratos:
+            abierto = almacen_pdfs.abrir(contrato)
+            if abierto is None:
+                _omitido(contrato, "no se pudo obtener su PDF.")
+                continue
+            nombre, origen = abierto
+            base, extension = os.path.splitext(nombre)
+            sufijo = 2
+            while nombre in nombres:
+                nombre = f"{base}_{sufijo}{extension}"
+                sufijo += 1
+            nombres.add(nombre)
+            with origen, archivo_zip.open(nombre, 'w') as destino:
+                while True:
+                    bloque = origen.read(BYTES_POR_BLOQUE)
+                    if not bloque:
+                        break
+                    destino.write(bloque)
+                    yield from salida.retirar()
+            yield from salida.retirar()
+    # Directorio central del ZIP
+    yield from salida.retirar()
+
+
+GENERADORES_PAQUETE = {
+    'pdf': generar_pdf_combinado,
+    'zip': generar_zip,
+}
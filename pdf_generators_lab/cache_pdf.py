@@ -0,0 +1,105 @@
+# pdf_generators_lab/cache_pdf.py
+# Caché en disco de PDFs ya generados, direccionada por contenido.
+# La clave es un hash de los datos que usa el contrato más la versión de su definición y
+# del motor (ver motor_pdf.clave_cache): si se vuelve a enviar el mismo formulario se
+# devuelve el PDF guardado sin dibujarlo otra vez, y cualquier cambio en una cláusula
+# produce claves nuevas, así los PDFs viejos dejan de usarse solos.
+# El tamaño total está acotado: al pasarse se borran los PDFs usados hace más tiempo (LRU).
+
+import os
+import threading
+from collections import OrderedDict
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache_pdfs")
+# Tamaño máximo de la caché en disco
+TAMANO_MAXIMO_CACHE = 200 * 1024 * 1024
+
+
+class CachePDF:
+    """
+    Guarda cada PDF como <clave>.pdf. La fecha de modificación del archivo se actualiza en
+    cada acierto, así el orden de uso se conserva entre reinicios de la aplicación.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, tamano_maximo=TAMANO_MAXIMO_CACHE):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self._entradas = None  # clave -> tamaño, de la usada hace más tiempo a la más reciente
+        self._total = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.pdf")
+
+    def _cargar(self):
+        # Se llama con el lock tomado. Recorre el directorio solo la primera vez.
+        if self._entradas is not None:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        archivos = []
+        with os.scandir(self.directorio) as it:
+            for entrada in it:
+                if entrada.name.endswith('.pdf'):
+                    info = entrada.stat()
+                    archivos.append((info.st_mtime, entrada.name[:-len('.pdf')], info.st_size))
+        self._entradas = OrderedDict((clave, tamano) for _, clave, tamano in sorted(archivos))
+        self._total = sum(self._entradas.values())
+
+    def obtener(self, clave):
+        """Devuelve el contenido del PDF guardado con esa clave, o None si no está."""
+        with self._lock:
+            self._cargar()
+            if clave not in self._entradas:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                contenido = f.read()
+            os.utime(ruta)
+        except FileNotFoundError:
+            # Lo borró otro proceso al liberar espacio
+            with self._lock:
+                self._total -= self._entradas.pop(clave, 0)
+                self.fallos += 1
+            return None
+        with self._lock:
+            self.aciertos += 1
+        return contenido
+
+    def guardar(self, clave, contenido):
+        """Guarda un PDF y libera espacio si la caché supera su tamaño máximo."""
+        ruta = self._ruta(clave)
+        with self._lock:
+            self._cargar()
+        ruta_temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(ruta_temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(ruta_temporal, ruta)
+        with self._lock:
+            self._total += len(contenido) - self._entradas.pop(clave, 0)
+            self._entradas[clave] = len(contenido)
+            while self._total > self.tamano_maximo and len(self._entradas) > 1:
+                antigua, tamano = self._entradas.popitem(last=False)
+                self._total -= tamano
+                try:
+                    os.remove(self._ruta(antigua))
+                except FileNotFoundError:
+                    pass
+
+    def estadisticas(self):
+        with self._lock:
+            self._cargar()
+            return {
+                'entradas': len(self._entradas),
+                'bytes': self._total,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+            }
+
+
+# Caché compartida por todos los tipos de contrato del proceso
+cache_pdfs = CachePDF()
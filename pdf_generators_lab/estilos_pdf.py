@@ -0,0 +1,70 @@
+# pdf_generators_lab/estilos_pdf.py
+# Estilos compartidos por todos los generadores de contratos.
+# Se construyen una sola vez al importar el módulo y se reutilizan en cada PDF, en lugar de
+# llamar a getSampleStyleSheet() y crear los mismos ParagraphStyle/TableStyle por contrato.
+
+from collections import namedtuple
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
+
+# Conjunto de estilos de párrafo de un contrato. Es una tupla: no se le pueden reasignar
+# estilos, y los generadores no deben modificar los objetos que contiene.
+EstilosContrato = namedtuple('EstilosContrato', ['body', 'bold', 'title', 'cell_label', 'cell_value'])
+
+_styles = getSampleStyleSheet()
+
+
+def _crear_estilos(font_size, leading):
+    """Crea los estilos de un contrato con el tamaño de letra e interlineado del cuerpo dados."""
+    style_body = ParagraphStyle('Body', parent=_styles['BodyText'], alignment=TA_JUSTIFY, fontSize=font_size, leading=leading)
+    return EstilosContrato(
+        body=style_body,
+        bold=ParagraphStyle('Bold', parent=style_body, fontName='Helvetica-Bold'),
+        title=ParagraphStyle('TitleCustom', parent=_styles['h1'], fontName='Helvetica-Bold', fontSize=12, alignment=TA_CENTER, spaceAfter=20),
+        # Estilos para la tabla de datos
+        cell_label=ParagraphStyle('CellLabel', parent=_styles['Normal'], fontName='Helvetica-Bold', fontSize=8),
+        cell_value=ParagraphStyle('CellValue', parent=_styles['Normal'], fontSize=8, wordWrap='CJK'),
+    )
+
+
+def _crear_estilo_tabla(padding_vertical=None):
+    """Estilo de la tabla de variables de la primera página."""
+    comandos = [
+        # Estilos generales
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('LEFTPADDING', (0,0), (-1,-1), 6),
+        ('RIGHTPADDING', (0,0), (-1,-1), 6),
+    ]
+    if padding_vertical is not None:
+        comandos += [
+            ('TOPPADDING', (0,0), (-1,-1), padding_vertical),
+            ('BOTTOMPADDING', (0,0), (-1,-1), padding_vertical),
+        ]
+    comandos += [
+        # Estilos de borde
+        ('GRID', (0,0), (-1,-1), 0.5, colors.darkgrey),   # Rejilla interna más visible
+        ('BOX', (0,0), (-1,-1), 1.5, colors.black),      # Borde exterior grueso y negro
+        # Estilo de fondo para la columna de etiquetas
+        ('BACKGROUND', (0,0), (0,-1), colors.HexColor('#F0F0F0')),
+    ]
+    return TableStyle(comandos)
+
+
+# Diseño completo de un tipo de contrato: estilos más las medidas que cambian entre tipos.
+#   espacio_firmas: espacio vertical que se deja antes de cada bloque de firmas.
+#   x_firma_anexos: posición horizontal de la firma del trabajador al pie de los anexos.
+#   fuente_paginacion: tamaño de letra del número de página.
+DisenoContrato = namedtuple('DisenoContrato', ['estilos', 'estilo_tabla', 'espacio_firmas', 'x_firma_anexos', 'fuente_paginacion'])
+
+# Obra o Labor: cuerpo en 10 pt y tabla con más aire vertical
+ESTILOS_OBRA_LABOR = _crear_estilos(font_size=10, leading=14)
+ESTILO_TABLA_OBRA_LABOR = _crear_estilo_tabla(padding_vertical=4)
+DISENO_OBRA_LABOR = DisenoContrato(ESTILOS_OBRA_LABOR, ESTILO_TABLA_OBRA_LABOR, 1.5 * inch, 3 * inch, 9)
+
+# Término Fijo y Término Indefinido: cuerpo compacto en 9 pt
+ESTILOS_COMPACTOS = _crear_estilos(font_size=9, leading=12)
+ESTILO_TABLA_COMPACTA = _crear_estilo_tabla()
+DISENO_COMPACTO = DisenoContrato(ESTILOS_COMPACTOS, ESTILO_TABLA_COMPACTA, 1.0 * inch, 2.75 * inch, 8)
@@ -0,0 +1,482 @@
+# pdf_generators_lab/motor_pdf.py
+# Motor único de renderizado de contratos laborales.
+# Cada tipo de contrato se describe como datos (DefinicionContrato): título, campos de la
+# tabla, cláusulas, firmas y anexos. El motor dibuja la misma estructura para todos:
+# título y tabla de variables, introducción, cláusulas, firmas, anexos y pie de página.
+#
+# Las partes que no dependen de los datos del trabajador (título, introducción, cláusulas
+# sin variables, anexos y etiquetas de la tabla) se construyen y se acomodan al ancho de
+# la página una sola vez por tipo de contrato, y se reutilizan en cada PDF.
+
+import copy
+import hashlib
+import io
+import json
+import os
+import string
+import itertools
+import threading
+from collections import namedtuple
+import reportlab
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Table
+from pdf_generators_lab.cache_pdf import cache_pdfs
+
+WIDTH, HEIGHT = letter
+# Ancho útil de la página (márgenes de una pulgada a cada lado)
+ANCHO_UTIL = WIDTH - 2 * inch
+ANCHOS_COLUMNAS_TABLA = [2.3 * inch, 4.2 * inch]
+LINEA_FIRMA = "___________________________________"
+TEXTO_COPYRIGHT = "© 2015 HEBITECH. All rights reserved."
+# Cambiarla al modificar el dibujo de dibujar_contrato: invalida los PDFs de la caché
+VERSION_MOTOR = 1
+# Planes de paginación guardados por tipo de contrato (uno por combinación de alturas de
+# los párrafos variables; en la práctica unos pocos)
+MAX_PLANES_POR_DEFINICION = 256
+DIRECTORIO_PDFS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdfs_laboral")
+
+
+def campos_tabla_laboral(etiqueta_duracion="Duración del Contrato:", valor_duracion="{final_time}"):
+    """Las 23 variables de la tabla de la primera página; solo cambia la fila de duración."""
+    return [
+        ("Número de Contrato:", "{contract_number}"),
+        ("Fecha del Contrato:", "{contract_date}"),
+        ("Nombre del Empleador:", "{employer_name}"),
+        ("NIT del Empleador:", "{employer_nit}"),
+        ("Representante Legal:", "{legal_representative}"),
+        ("Cédula Rep. Legal:", "{legal_representative_id}"),
+        ("Dirección del Empleador:", "{employer_address}"),
+        ("Nombre del Trabajador:", "{contractor_name}"),
+        ("Cédula del Trabajador:", "{contractor_id}"),
+        ("Lugar Nacimiento:", "{city_birth}"),
+        ("Fecha Nacimiento:", "{date_birth}"),
+        ("Dirección del Trabajador:", "{contractor_address}"),
+        ("Teléfono del Trabajador:", "{contractor_phone}"),
+        ("Email del Trabajador:", "{contractor_email}"),
+        ("Contacto de Emergencia:", "{name_number_emergency}"),
+        ("Cargo del Trabajador:", "{workers_position}"),
+        ("Actividad a Realizar:", "{activity}"),
+        (etiqueta_duracion, valor_duracion),
+        ("Fecha de Inicio:", "{start_date}"),
+        ("Nombre del Proyecto o Centro de Costos:", "{project_name}"),
+        ("Lugar de Ejecución:", "{project_city}"),
+        ("Salario Mensual:", "{salary}"),
+        ("Frecuencia de Pago:", "{payment_frequency}"),
+    ]
+
+
+class _FormateadorDatos(string.Formatter):
+    """
+    Rellena las plantillas con los datos del formulario.
+    Un campo ausente queda vacío, y '{a|b}' usa 'b' solo si 'a' no viene en los datos.
+    """
+
+    def get_value(self, key, args, kwargs):
+        for clave in key.split('|'):
+            if clave in kwargs:
+                valor = kwargs[clave]
+                return '' if valor is None else valor
+        return ''
+
+
+_formateador = _FormateadorDatos()
+
+
+def _campos(plantilla):
+    """Nombres de los campos de datos que usa una plantilla ('{a|b}' usa a y b)."""
+    return [clave for _, campo, _, _ in _formateador.parse(plantilla) if campo is not None for clave in campo.split('|')]
+
+
+def _tiene_variables(plantilla):
+    """Indica si la plantilla contiene algún campo '{...}' a rellenar con los datos."""
+    return bool(_campos(plantilla))
+
+
+def _descripcion_estilo(estilo):
+    # Los estilos de ReportLab tienen repr estables (sin direcciones de memoria)
+    return sorted((clave, repr(valor)) for clave, valor in vars(estilo).items())
+
+
+class _ParrafoFijo:
+    """Párrafo sin variables, ya acomodado al ancho útil; se dibuja tantas veces como se quiera."""
+
+    def __init__(self, texto, estilo):
+        self.parrafo = Paragraph(texto, estilo)
+        self.ancho, self.alto = self.parrafo.wrap(ANCHO_UTIL, HEIGHT)
+
+    def acomodar(self, datos):
+        # drawOn guarda el canvas en el propio párrafo: se dibuja una copia para que
+        # varios hilos puedan usar la misma definición a la vez.
+        return copy.copy(self.parrafo), self.alto
+
+
+class _ParrafoVariable:
+    """Párrafo con variables: se rellena y se acomoda en cada contrato."""
+
+    def __init__(self, plantilla, estilo):
+        self.plantilla = plantilla
+        self.estilo = estilo
+
+    def acomodar(self, datos):
+        parrafo = Paragraph(_formateador.format(self.plantilla, **datos), self.estilo)
+        _, alto = parrafo.wrap(ANCHO_UTIL, HEIGHT)
+        return parrafo, alto
+
+
+def _compilar_parrafo(plantilla, estilo):
+    if _tiene_variables(plantilla):
+        return _ParrafoVariable(plantilla, estilo)
+    return _ParrafoFijo(plantilla, estilo)
+
+
+# Posición de cada párrafo de cláusulas y anexos. Cada página es una lista de (índice, y),
+# con y la posición del borde inferior del párrafo.
+PlanPaginas = namedtuple('PlanPaginas', ['id', 'paginas_clausulas', 'firmas_en_pagina_nueva', 'y_firmas', 'paginas_anexos', 'y_firma_anexos'])
+
+
+def _paginar(alturas, y_inicial):
+    """Reparte párrafos de las alturas dadas en páginas, como lo hacía draw_paragraph."""
+    paginas = [[]]
+    y_position = y_inicial
+    for indice, alto in enumerate(alturas):
+        if alto > y_position - inch: # Si no cabe, nueva página
+            paginas.append([])
+            y_position = HEIGHT - inch
+        paginas[-1].append((indice, y_position - alto))
+        y_position -= (alto + 10)
+    return paginas, y_position
+
+
+class DefinicionContrato:
+    """
+    Describe un tipo de contrato.
+
+    Args:
+        nombre (str): Nombre corto usado en los mensajes ("Obra o Labor").
+        descripcion (str): Nombre largo para el mensaje de éxito ("Contrato de Obra o Labor").
+        prefijo_archivo (str): Inicio del nombre del PDF ("Contrato_Obra_Labor").
+        titulo (str): Título de la primera página.
+        diseno (DisenoContrato): Estilos y medidas (ver estilos_pdf).
+        campos_tabla (list): Pares (etiqueta, plantilla) de la tabla de variables.
+        introduccion (str): Texto bajo la tabla de la primera página.
+        encabezado_clausulas (str): Plantilla del párrafo que abre las cláusulas.
+        clausulas (list): Pares (título, plantilla) de las cláusulas.
+        firma_empleador, firma_trabajador (tuple): (título, [plantillas de las líneas bajo la firma]).
+        anexos (list): Pares (plantilla, 'bold' o 'body') de la página de anexos.
+
+    Las plantillas usan los nombres de campo del formulario entre llaves, p. ej. '{salary}'.
+    """
+
+    def __init__(self, nombre, descripcion, prefijo_archivo, titulo, diseno, campos_tabla,
+                 introduccion, encabezado_clausulas, clausulas, firma_empleador, firma_trabajador, anexos):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.prefijo_archivo = prefijo_archivo
+        self.titulo = titulo
+        self.diseno = diseno
+        self.campos_tabla = campos_tabla
+        self.introduccion = introduccion
+        self.encabezado_clausulas = encabezado_clausulas
+        self.clausulas = clausulas
+        self.firma_empleador = firma_empleador
+        self.firma_trabajador = firma_trabajador
+        self.anexos = anexos
+        self._compilada = None
+        self._lock = threading.Lock()
+
+    def compilada(self):
+        """Construye las partes fijas la primera vez que se usa el tipo de contrato."""
+        if self._compilada is None:
+            with self._lock:
+                if self._compilada is None:
+                    self._compilada = _DefinicionCompilada(self)
+        return self._compilada
+
+
+class _DefinicionCompilada:
+    """Párrafos de una definición listos para dibujar."""
+
+    def __init__(self, definicion):
+        estilos = definicion.diseno.estilos
+        self.titulo = _ParrafoFijo(definicion.titulo, estilos.title)
+        self.introduccion = _ParrafoFijo(definicion.introduccion, estilos.body)
+        self.etiquetas_tabla = [Paragraph(f"<b>{etiqueta}</b>", estilos.cell_label) for etiqueta, _ in definicion.campos_tabla]
+        self.valores_tabla = [plantilla for _, plantilla in definicion.campos_tabla]
+        self.clausulas = [_compilar_parrafo(definicion.encabezado_clausulas, estilos.body)]
+        self.clausulas += [_compilar_parrafo(f"<b>{titulo}</b> {texto}", estilos.body) for titulo, texto in definicion.clausulas]
+        self.anexos = [_compilar_parrafo(texto, getattr(estilos, estilo)) for texto, estilo in definicion.anexos]
+        self.espacio_firmas = definicion.diseno.espacio_firmas
+        self.prefijo_formas = definicion.prefijo_archivo
+        self._planes = {}
+        self._ids_planes = itertools.count()  # los ids no se repiten aunque se vacíe la caché
+        self._lock_planes = threading.Lock()
+
+        plantillas = [plantilla for _, plantilla in definicion.campos_tabla]
+        plantillas += [definicion.encabezado_clausulas] + [texto for _, texto in definicion.clausulas]
+        plantillas += definicion.firma_empleador[1] + definicion.firma_trabajador[1]
+        plantillas += [texto for texto, _ in definicion.anexos]
+        # Campos del formulario que cambian el contenido del PDF
+        self.campos = frozenset(campo for plantilla in plantillas for campo in _campos(plantilla))
+        # Huella de todo lo que define el dibujo: textos, estilos, medidas y versiones
+        diseno = definicion.diseno
+        descripcion = {
+            'motor': VERSION_MOTOR,
+            'reportlab': reportlab.Version,
+            'titulo': definicion.titulo,
+            'campos_tabla': definicion.campos_tabla,
+            'introduccion': definicion.introduccion,
+            'encabezado_clausulas': definicion.encabezado_clausulas,
+            'clausulas': definicion.clausulas,
+            'firmas': [definicion.firma_empleador, definicion.firma_trabajador],
+            'anexos': definicion.anexos,
+            'estilos': [_descripcion_estilo(estilo) for estilo in estilos],
+            'estilo_tabla': repr(diseno.estilo_tabla.getCommands()),
+            'medidas': [diseno.espacio_firmas, diseno.x_firma_anexos, diseno.fuente_paginacion],
+        }
+        self.huella = hashlib.sha256(json.dumps(descripcion, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+    def plan(self, alturas_clausulas, alturas_anexos):
+        """
+        Plan de páginas para las alturas dadas de cláusulas y anexos. Solo los párrafos
+        variables cambian de alto entre contratos, así que el plan se calcula una vez por
+        combinación de alturas y se reutiliza.
+        """
+        clave = (alturas_clausulas, alturas_anexos)
+        plan = self._planes.get(clave)
+        if plan is not None:
+            return plan
+        paginas_clausulas, y_position = _paginar(alturas_clausulas, HEIGHT - inch)
+        firmas_en_pagina_nueva = y_position < 3 * inch
+        if firmas_en_pagina_nueva:
+            y_position = HEIGHT - inch
+        y_firmas = y_position - self.espacio_firmas
+        paginas_anexos, y_position = _paginar(alturas_anexos, HEIGHT - inch)
+        with self._lock_planes:
+            if len(self._planes) >= MAX_PLANES_POR_DEFINICION:
+                self._planes.clear()
+            plan = self._planes.get(clave) or self._planes.setdefault(clave, PlanPaginas(
+                next(self._ids_planes), paginas_clausulas, firmas_en_pagina_nueva, y_firmas,
+                paginas_anexos, y_position - self.espacio_firmas,
+            ))
+        return plan
+
+
+def _acomodar_variables(parrafos, datos):
+    """Rellena los párrafos variables; devuelve {índice: (párrafo, alto)} y las alturas de todos."""
+    variables = {}
+    alturas = []
+    for indice, parrafo in enumerate(parrafos):
+        if isinstance(parrafo, _ParrafoVariable):
+            variables[indice] = parrafo.acomodar(datos)
+            alturas.append(variables[indice][1])
+        else:
+            alturas.append(parrafo.alto)
+    return variables, tuple(alturas)
+
+
+def _dibujar_paginas(c, paginas, parrafos, variables, nombre_formas, new_page):
+    """
+    Dibuja páginas ya planificadas. Con nombre_formas, los párrafos fijos seguidos de una
+    misma página van en un form XObject: se dibujan una vez por documento y cada contrato
+    del mismo tipo que se agregue al canvas solo lo referencia. Sin él se dibujan directo.
+    """
+    for numero_pagina, pagina in enumerate(paginas):
+        if numero_pagina:
+            new_page()
+        if nombre_formas is None:
+            for indice, y in pagina:
+                p, _ = variables[indice] if indice in variables else parrafos[indice].acomodar(None)
+                p.drawOn(c, inch, y)
+            continue
+        bloque = []
+        for indice, y in pagina + [(None, None)]:
+            if bloque and (indice is None or indice in variables):
+                nombre = f"{nombre_formas}_{numero_pagina}_{bloque[0][0]}"
+                if not c.hasForm(nombre):
+                    c.beginForm(nombre)
+                    for indice_fijo, y_fijo in bloque:
+                        p, _ = parrafos[indice_fijo].acomodar(None)
+                        p.drawOn(c, inch, y_fijo)
+                    c.endForm()
+                c.doForm(nombre)
+                bloque = []
+            if indice is None:
+                break
+            if indice in variables:
+                variables[indice][0].drawOn(c, inch, y)
+            else:
+                bloque.append((indice, y))
+
+
+def clave_cache(definicion, datos):
+    """
+    Clave del PDF de un contrato en la caché: hash de la huella de la definición y de los
+    datos que usa el contrato, normalizados (solo los campos de las plantillas, en orden,
+    como texto y con None igual a vacío). Los demás campos del formulario no la cambian.
+    """
+    compilada = definicion.compilada()
+    normalizados = {
+        campo: '' if datos[campo] is None else str(datos[campo])
+        for campo in sorted(compilada.campos) if campo in datos
+    }
+    texto = json.dumps([compilada.huella, normalizados], ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def ruta_pdf_plana(definicion, datos):
+    """
+    Ruta que tenía el PDF de un contrato cuando todos se guardaban directamente en
+    pdfs_laboral. El almacén (almacen_pdfs.py) la consulta para adoptar esos archivos.
+    """
+    nombre_trabajador = datos.get('contractor_name', 'trabajador').replace(' ', '_')
+    numero_contrato = datos.get('contract_number', 'SNC')
+    nombre_archivo = f"{definicion.prefijo_archivo}_{numero_contrato}_{nombre_trabajador}.pdf"
+    return os.path.join(DIRECTORIO_PDFS, nombre_archivo)
+
+
+def guardar_pdf(ruta, contenido):
+    """
+    Escribe el PDF ya generado. Se escribe a un archivo temporal y se renombra, así una
+    descarga en curso nunca ve un archivo a medio escribir.
+    """
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_temporal = f"{ruta}.{threading.get_ident()}.tmp"
+    with open(ruta_temporal, 'wb') as f:
+        f.write(contenido)
+    os.replace(ruta_temporal, ruta)
+    return ruta
+
+
+def dibujar_contrato(c, definicion, datos, usar_formas=False):
+    """
+    Dibuja todas las páginas de un contrato en el canvas dado (sin guardarlo).
+
+    Con usar_formas, el texto fijo de cláusulas y anexos se guarda como form XObjects que
+    comparten todos los contratos del mismo tipo dibujados en el canvas. Conviene cuando
+    el canvas reúne varios contratos; en un PDF de un solo contrato solo agrega peso.
+    """
+    compilada = definicion.compilada()
+    diseno = definicion.diseno
+    estilos = diseno.estilos
+
+    # --- FUNCIÓN AUXILIAR PARA PAGINACIÓN ---
+    page_number = 1
+    def new_page():
+        nonlocal page_number
+        c.setFont("Helvetica", diseno.fuente_paginacion)
+        c.drawString(inch, 0.75 * inch, f"Página {page_number}")
+        c.showPage()
+        page_number += 1
+        c.setFont("Helvetica", diseno.fuente_paginacion)
+        return HEIGHT - inch
+
+    # --- 1. PÁGINA 1: TÍTULO Y TABLA DE VARIABLES ---
+    p_title, _ = compilada.titulo.acomodar(datos)
+    p_title.drawOn(c, inch, HEIGHT - inch * 1.2)
+
+    data_for_table = [
+        [copy.copy(etiqueta), Paragraph(_formateador.format(plantilla, **datos), estilos.cell_value)]
+        for etiqueta, plantilla in zip(compilada.etiquetas_tabla, compilada.valores_tabla)
+    ]
+    table = Table(data_for_table, colWidths=ANCHOS_COLUMNAS_TABLA)
+    table.setStyle(diseno.estilo_tabla)
+    table.wrapOn(c, ANCHO_UTIL, HEIGHT)
+    table_height = table._height
+    table.drawOn(c, inch, HEIGHT - inch * 1.5 - table_height)
+
+    y_position = HEIGHT - inch * 2 - table_height - 40
+    p_intro, _ = compilada.introduccion.acomodar(datos)
+    p_intro.drawOn(c, inch, y_position)
+
+    new_page()
+
+    # --- 2. CLÁUSULAS DEL CONTRATO ---
+    # Solo los párrafos con variables se acomodan por contrato; con sus alturas, el plan
+    # de páginas (y la posición de todos los párrafos fijos) sale de la caché del tipo.
+    variables_clausulas, alturas_clausulas = _acomodar_variables(compilada.clausulas, datos)
+    variables_anexos, alturas_anexos = _acomodar_variables(compilada.anexos, datos)
+    plan = compilada.plan(alturas_clausulas, alturas_anexos)
+    nombre_formas = f"{compilada.prefijo_formas}_{plan.id}" if usar_formas else None
+
+    _dibujar_paginas(c, plan.paginas_clausulas, compilada.clausulas, variables_clausulas,
+                     nombre_formas and f"{nombre_formas}_c", new_page)
+
+    # --- 3. FIRMAS ---
+    if plan.firmas_en_pagina_nueva:
+        new_page()
+
+    y_position = plan.y_firmas
+    c.setFont("Helvetica", 10)
+    for x, (titulo, lineas) in ((1.5 * inch, definicion.firma_empleador), (5 * inch, definicion.firma_trabajador)):
+        c.drawString(x, y_position, LINEA_FIRMA)
+        c.drawString(x, y_position - 15, titulo)
+        for i, linea in enumerate(lineas):
+            c.drawString(x, y_position - 30 - 15 * i, _formateador.format(linea, **datos))
+
+    # --- 4. ANEXOS Y DECLARACIÓN JURAMENTADA ---
+    new_page()
+    _dibujar_paginas(c, plan.paginas_anexos, compilada.anexos, variables_anexos,
+                     nombre_formas and f"{nombre_formas}_a", new_page)
+
+    y_position = plan.y_firma_anexos
+    c.drawString(diseno.x_firma_anexos, y_position, LINEA_FIRMA)
+    c.drawString(diseno.x_firma_anexos, y_position - 15, "FIRMA Y CÉDULA DEL TRABAJADOR")
+
+    # --- 5. PIE DE LA ÚLTIMA PÁGINA ---
+    c.setFont("Helvetica", diseno.fuente_paginacion)
+    c.drawString(inch, 0.75 * inch, f"Página {page_number}")
+
+    # Añadir la frase de copyright en la esquina inferior derecha de la última página
+    c.setFont("Helvetica", 8) # Arial 8 solicitado, usando Helvetica como alternativa estándar
+    c.drawRightString(WIDTH - inch, 0.5 * inch, TEXTO_COPYRIGHT) # 0.5 inch desde el borde inferior
+
+
+def renderizar_contrato(definicion, datos, en_memoria=False, usar_cache=True):
+    """
+    Genera el PDF de un contrato según su definición.
+    El PDF se arma en un buffer en memoria; salvo con en_memoria, luego se guarda en el
+    almacén de PDFs (pdfs_laboral, ver almacen_pdfs.py).
+    Si un contrato con los mismos datos ya se generó, se toma de la caché sin dibujarlo.
+
+    Args:
+        definicion (DefinicionContrato): Tipo de contrato a generar.
+        datos (dict): Un diccionario con los datos del formulario.
+        en_memoria (bool): Devolver el contenido del PDF en lugar de guardarlo.
+        usar_cache (bool): Consultar y alimentar la caché de PDFs.
+
+    Returns:
+        str | bytes: Ruta del PDF generado (o su contenido, con en_memoria), o None si hubo un error.
+    """
+    try:
+        clave = clave_cache(definicion, datos) if usar_cache else None
+        contenido = cache_pdfs.obtener(clave) if usar_cache else None
+        if contenido is None:
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=letter)
+            dibujar_contrato(c, definicion, datos)
+            c.save()
+            contenido = buffer.getvalue()
+            if usar_cache:
+                cache_pdfs.guardar(clave, contenido)
+        else:
+            print(f"PDF de {definicion.descripcion} tomado de la caché ({clave[:12]})")
+        if en_memoria:
+            print(f"✅ PDF de {definicion.descripcion} generado en memoria ({len(contenido)} bytes)")
+            return contenido
+
+        # El almacén usa el registro de contratos; se importa aquí para no atar el motor a él
+        from almacen_pdfs import almacen_pdfs
+        filepath = almacen_pdfs.guardar(definicion, datos, contenido)
+        print(f"✅ PDF de {definicion.descripcion} generado exitosamente en: {filepath}")
+        return filepath
+
+    except Exception as e:
+        print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+        print(f"Error al generar el PDF de {definicion.nombre}: {e}")
+        import traceback
+        print(traceback.format_exc())
+        print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+        return None
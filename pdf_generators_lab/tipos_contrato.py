@@ -0,0 +1,33 @@
+# pdf_generators_lab/tipos_contrato.py
+# Tipos de contrato disponibles: nombre (el mismo que se guarda en 'tipo_contrato'),
+# definición para el motor de PDFs, función generadora y campos obligatorios del formulario.
+# Para activar un tipo nuevo basta con agregar su definición aquí.
+
+from pdf_generators_lab.obra_labor_pdf import DEFINICION_OBRA_LABOR, generar_pdf_obra_labor
+from pdf_generators_lab.termino_fijo_pdf import DEFINICION_TERMINO_FIJO, generar_pdf_termino_fijo
+from pdf_generators_lab.termino_indefinido_pdf import DEFINICION_TERMINO_INDEFINIDO, generar_pdf_termino_indefinido
+
+DEFINICIONES = {
+    "Obra o Labor": DEFINICION_OBRA_LABOR,
+    "Término Fijo": DEFINICION_TERMINO_FIJO,
+    "Término Indefinido": DEFINICION_TERMINO_INDEFINIDO,
+}
+
+GENERADORES_PDF = {
+    "Obra o Labor": generar_pdf_obra_labor,
+    "Término Fijo": generar_pdf_termino_fijo,
+    "Término Indefinido": generar_pdf_termino_indefinido,
+}
+
+# Campos marcados como 'required' en los formularios de cada tipo
+_CAMPOS_COMUNES = [
+    'contract_date', 'employer_name', 'employer_nit', 'employer_address',
+    'contractor_name', 'contractor_id', 'contractor_address', 'city_birth', 'date_birth',
+    'contractor_phone', 'name_number_emergency', 'workers_position', 'start_date',
+    'activity', 'project_city', 'salary', 'payment_frequency',
+]
+CAMPOS_OBLIGATORIOS = {
+    "Obra o Labor": _CAMPOS_COMUNES + ['final_time'],
+    "Término Fijo": _CAMPOS_COMUNES + ['final_time'],
+    "Término Indefinido": ['contract_number'] + _CAMPOS_COMUNES + ['legal_representative', 'legal_representative_id'],
+}
@@ -0,0 +1,1072 @@
+# registro_contratos.py
+# Registro de contratos laborales sobre SQLite.
+# Cada contrato nuevo es un único INSERT (costo constante); el archivo contratos_lab.xlsx
+# ya no es la fuente de datos, sino una vista que se exporta bajo demanda para Gestión Humana.
+# Todas las escrituras pasan por un único hilo escritor que agrupa las operaciones
+# pendientes en una sola transacción.
+
+import sqlite3
+import json
+import os
+import sys
+import queue
+import threading
+from functools import cached_property
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+from exportacion_contratos import escribir_xlsx
+
+# --- Configuración ---
+DB_FILE = "contratos_lab.db"
+EXCEL_FILE = "contratos_lab.xlsx"
+COLUMNA_ALERTA = 'Alerta_40_Dias_Enviada'
+# Máximo de operaciones que el escritor confirma en una misma transacción
+MAX_OPERACIONES_POR_LOTE = 500
+# Segundos que una conexión espera a que otro proceso libere el bloqueo de escritura
+TIMEOUT_BLOQUEO = 30
+# Segundos de inactividad tras una escritura antes de regenerar la instantánea
+DEMORA_INSTANTANEA = 2.0
+# Paginación de la lista de contratos
+TAMANO_PAGINA_POR_DEFECTO = 50
+TAMANO_PAGINA_MAXIMO = 500
+
+# Columnas del índice de PDFs (tabla archivos_pdf)
+_COLUMNAS_PDF = ('contract_number', 'ruta', 'tamano', 'sha256', 'guardado_en', 'archivado_en')
+
+# Bandeja de salida de correos (tabla correos_salientes, ver bandeja_correo.py)
+CORREO_PENDIENTE = 'pendiente'
+CORREO_ENVIANDO = 'enviando'
+CORREO_ENVIADO = 'enviado'
+CORREO_FALLIDO = 'fallido'
+# Columnas de un correo sin el mensaje completo, para listarlos
+_COLUMNAS_CORREO = (
+    'id', 'tipo', 'asunto', 'destinatarios', 'estado', 'intentos',
+    'proximo_intento', 'ultimo_error', 'creado_en', 'enviado_en',
+)
+
+# Campos que además de guardarse en el JSON del contrato se copian a columnas propias,
+# para poder filtrarlos e indexarlos directamente en SQL.
+COLUMNAS_INDEXADAS = (
+    'contract_number',
+    'contractor_id',
+    'project_name',
+    'tipo_contrato',
+    'start_date',
+    'estimated_end_date',
+)
+# Formatos aceptados para estimated_end_date, en orden. La hora, si viene, se ignora.
+FORMATOS_FECHA_FIN = ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y')
+
+
+class VistaRegistro:
+    """
+    Vista en caché del registro completo. Las representaciones derivadas del DataFrame se
+    calculan la primera vez que se piden: leer_contratos() solo usa el DataFrame, mientras
+    que la lista web usa los registros y los textos de búsqueda.
+    """
+
+    def __init__(self, firma, df):
+        self.firma = firma
+        self.df = df
+        self.columnas = list(df.columns)
+
+    @cached_property
+    def _valores(self):
+        # to_numpy(dtype=object) es mucho más rápido que to_dict(orient="records")
+        return self.df.fillna('').to_numpy(dtype=object).tolist()
+
+    @cached_property
+    def registros(self):
+        """Contratos como diccionarios, con los valores vacíos como ''."""
+        return [dict(zip(self.columnas, fila)) for fila in self._valores]
+
+    @cached_property
+    def textos_busqueda(self):
+        """Por cada registro, todos sus valores unidos y en mayúsculas para filtrar sin recorrer celda por celda."""
+        return [" ".join(map(str, fila)).upper() for fila in self._valores]
+
+
+class ContratoDuplicadoError(ValueError):
+    """Se intentó registrar un contract_number que ya existe en el registro."""
+
+    def __init__(self, numero_contrato):
+        super().__init__(f"Ya existe un contrato registrado con el número '{numero_contrato}'.")
+        self.numero_contrato = numero_contrato
+
+
+def _clave_orden(valor):
+    """Clave de ordenamiento: los valores numéricos antes que el texto, el texto sin distinguir mayúsculas."""
+    try:
+        return (0, float(valor), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(valor).lower())
+
+
+def _texto(valor):
+    """Normaliza un valor del formulario para las columnas indexadas (None si está vacío)."""
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+
+def _fecha_fin_normalizada(texto):
+    """
+    Fecha final estimada como AAAA-MM-DD, o None si no coincide con FORMATOS_FECHA_FIN.
+    Acepta también la fecha con hora ('2024-12-31 00:00:00' o el '2024-12-31T00:00:00' de un Excel).
+    """
+    if len(texto) > 10 and texto[10] in ' T':
+        texto = texto[:10]
+    for formato in FORMATOS_FECHA_FIN:
+        try:
+            return datetime.strptime(texto, formato).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class RegistroContratos:
+    """
+    Registro de contratos respaldado por una base SQLite embebida.
+
+    Los datos completos de cada contrato se guardan como JSON (así se conservan todas las
+    columnas del formulario, sin importar el tipo de contrato) y los campos de
+    COLUMNAS_INDEXADAS se copian a columnas propias.
+
+    Dentro del proceso, las escrituras se serializan en un hilo escritor dedicado; entre
+    procesos (la app web y alert_checker.py), cada lote toma el bloqueo de escritura de
+    SQLite con BEGIN IMMEDIATE, así ninguna escritura pisa a otra.
+    """
+
+    def __init__(self, db_file=DB_FILE, excel_file=EXCEL_FILE):
+        self.db_file = db_file
+        self.excel_file = excel_file
+        self._inicializado = False
+        self._lock_inicio = threading.Lock()
+        self._cola = queue.Queue()
+        self._hilo_escritor = None
+        # Caché de la vista completa del registro (VistaRegistro).
+        # _generacion aumenta con cada lote confirmado por el escritor de este proceso.
+        self._generacion = 0
+        self._cache = None
+        self._lock_cache = threading.Lock()
+        # Instantánea del registro (JSON por columnas) junto a la base (ver _cargar_contratos)
+        self.snapshot_file = os.path.splitext(db_file)[0] + ".snapshot"
+        self._temporizador_instantanea = None
+
+    # --- Conexión y esquema ---
+
+    def _nueva_conexion(self):
+        conn = sqlite3.connect(self.db_file, timeout=TIMEOUT_BLOQUEO, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _conectar(self):
+        """Abre una conexión para lecturas y la cierra siempre."""
+        conn = self._nueva_conexion()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _inicializar(self):
+        """Crea el esquema la primera vez y migra el Excel existente si la base es nueva."""
+        if self._inicializado:
+            return
+        with self._lock_inicio:
+            if not self._inicializado:
+                self._crear_esquema()
+                self._inicializado = True
+
+    def _crear_esquema(self):
+        filas_iniciales = []
+        if not os.path.exists(self.db_file) and os.path.exists(self.excel_file):
+            # Migración única: el Excel existente se lee antes de crear la base, así un
+            # error de lectura no deja una base vacía que impida reintentar.
+            filas_iniciales = self._filas_desde_excel(self.excel_file)
+        columnas = ",\n".join(f"{col} TEXT" for col in COLUMNAS_INDEXADAS)
+        with self._conectar() as conn, self._transaccion(conn):
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS contratos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    {columnas},
+                    creado_en TEXT NOT NULL,
+                    datos TEXT NOT NULL
+                )
+            """)
+            # La versión aumenta con cada lote escrito; con ella se sabe si la instantánea está al día
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (clave, valor) VALUES ('version', 0)")
+            # Columnas de los datos en orden de aparición, para exportar sin recorrer el registro dos veces
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS columnas_datos (
+                    posicion INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nombre TEXT NOT NULL UNIQUE
+                )
+            """)
+            if conn.execute("SELECT 1 FROM columnas_datos LIMIT 1").fetchone() is None:
+                for (datos,) in conn.execute("SELECT datos FROM contratos ORDER BY id").fetchall():
+                    self._registrar_columnas(conn, json.loads(datos))
+            # Índice de los PDFs guardados (ver almacen_pdfs.py): ruta relativa a pdfs_laboral,
+            # tamaño y checksum de cada contrato, para ubicarlos sin recorrer la carpeta.
+            # archivado_en es el ZIP anual que guarda el PDF una vez archivado (ver archivado_pdfs.py).
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS archivos_pdf (
+                    contract_number TEXT PRIMARY KEY COLLATE NOCASE,
+                    ruta TEXT NOT NULL UNIQUE,
+                    tamano INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    guardado_en TEXT NOT NULL,
+                    archivado_en TEXT
+                )
+            """)
+            columnas_pdf = [fila[1] for fila in conn.execute("PRAGMA table_info(archivos_pdf)")]
+            if 'archivado_en' not in columnas_pdf:
+                conn.execute("ALTER TABLE archivos_pdf ADD COLUMN archivado_en TEXT")
+            # Bandeja de salida: los correos se guardan aquí en la ruta de la petición y los
+            # envía después un hilo aparte, con reintentos (ver bandeja_correo.py)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS correos_salientes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    asunto TEXT,
+                    destinatarios TEXT NOT NULL,
+                    mensaje BLOB NOT NULL,
+                    estado TEXT NOT NULL,
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    proximo_intento TEXT NOT NULL,
+                    reclamado_en TEXT,
+                    ultimo_error TEXT,
+                    creado_en TEXT NOT NULL,
+                    enviado_en TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_correos_estado ON correos_salientes (estado, proximo_intento)")
+            self._crear_vencimientos(conn)
+            if filas_iniciales:
+                self._insertar_filas(conn, filas_iniciales, rechazar_duplicados=False)
+                self._incrementar_version(conn)
+                print(f"Se importaron {len(filas_iniciales)} contratos desde {self.excel_file} a {self.db_file}")
+            self._crear_indices(conn)
+
+    def _crear_vencimientos(self, conn):
+        """
+        Índice de vencimientos: la fecha final estimada normalizada (AAAA-MM-DD) de cada contrato
+        que la tiene, ordenada por un índice, y el estado de su alerta. El verificador de alertas
+        consulta solo el tramo de fechas de la ventana en lugar de recorrer todo el registro, y
+        marcar una alerta no toca la tabla de contratos (ni invalida la instantánea).
+        fecha_fin es NULL si la fecha del contrato no se pudo interpretar.
+        """
+        existia = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vencimientos'"
+        ).fetchone() is not None
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS vencimientos (
+                id_contrato INTEGER PRIMARY KEY,
+                fecha_fin TEXT,
+                alerta_enviada INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_vencimientos_fecha ON vencimientos (fecha_fin, alerta_enviada)")
+        # Solo las alertas enviadas, para encontrar las que hay que resetear sin recorrer el resto
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_vencimientos_alertados ON vencimientos (fecha_fin) WHERE alerta_enviada = 1"
+        )
+        if existia:
+            return
+        # Migración única de una base anterior, donde la alerta era la columna contratos.alerta_enviada
+        columnas = [fila[1] for fila in conn.execute("PRAGMA table_info(contratos)")]
+        alerta = "alerta_enviada" if "alerta_enviada" in columnas else "0"
+        filas = conn.execute(
+            f"SELECT id, estimated_end_date, {alerta} FROM contratos WHERE estimated_end_date IS NOT NULL"
+        ).fetchall()
+        for id_contrato, fecha_fin, alerta_enviada in filas:
+            self._registrar_vencimiento(conn, id_contrato, fecha_fin, alerta_enviada)
+        if filas:
+            print(f"Índice de vencimientos creado con {len(filas)} contratos.")
+
+    @staticmethod
+    def _registrar_vencimiento(conn, id_contrato, fecha_fin, alerta_enviada=False):
+        """Agrega el contrato al índice de vencimientos si tiene fecha final estimada."""
+        if fecha_fin is None:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO vencimientos (id_contrato, fecha_fin, alerta_enviada) VALUES (?, ?, ?)",
+            (id_contrato, _fecha_fin_normalizada(fecha_fin), int(bool(alerta_enviada))),
+        )
+
+    @staticmethod
+    def _incrementar_version(conn):
+        conn.execute("UPDATE meta SET valor = valor + 1 WHERE clave = 'version'")
+
+    @staticmethod
+    def _leer_version(conn):
+        return conn.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0]
+
+    def _crear_indices(self, conn):
+        """Índice único por número de contrato e índices secundarios por cédula y proyecto."""
+        try:
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_contratos_numero ON contratos (contract_number COLLATE NOCASE)"
+            )
+        except sqlite3.IntegrityError:
+            # Registros heredados con números repetidos: se indexa igual y los duplicados
+            # nuevos se siguen rechazando en _insertar_filas.
+            repetidos = [fila[0] for fila in conn.execute(
+                "SELECT contract_number FROM contratos WHERE contract_number IS NOT NULL "
+                "GROUP BY contract_number COLLATE NOCASE HAVING COUNT(*) > 1"
+            )]
+            print(f"Advertencia: el registro tiene números de contrato repetidos {repetidos}; "
+                  "se crea un índice no único para contract_number.")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_contratos_numero ON contratos (contract_number COLLATE NOCASE)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_contratos_cedula ON contratos (contractor_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_contratos_proyecto ON contratos (project_name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_contratos_inicio ON contratos (start_date)")
+
+    @staticmethod
+    def _registrar_columnas(conn, datos):
+        conn.executemany("INSERT OR IGNORE INTO columnas_datos (nombre) VALUES (?)", [(col,) for col in datos])
+
+    @staticmethod
+    @contextmanager
+    def _transaccion(conn):
+        """Transacción con bloqueo de escritura tomado desde el inicio (BEGIN IMMEDIATE)."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _fila(datos, alerta_enviada=False):
+        """
+        Convierte el diccionario de un contrato en (tupla que se inserta en la tabla, alerta
+        enviada). El estado de la alerta no va en contratos sino en el índice de vencimientos.
+        """
+        valores = [_texto(datos.get(col)) for col in COLUMNAS_INDEXADAS]
+        fila = (
+            *valores,
+            datetime.now().isoformat(timespec='seconds'),
+            json.dumps(datos, ensure_ascii=False),
+        )
+        return fila, bool(alerta_enviada)
+
+    def _insertar_filas(self, conn, filas, rechazar_duplicados=True):
+        """
+        Inserta las filas dadas (pares de _fila) y devuelve la lista de ids asignados.
+
+        Con rechazar_duplicados, un contract_number ya registrado (o repetido dentro de las
+        mismas filas) lanza ContratoDuplicadoError; la búsqueda usa el índice, O(log n).
+        """
+        columnas = ", ".join(COLUMNAS_INDEXADAS)
+        marcadores = ", ".join("?" for _ in range(len(COLUMNAS_INDEXADAS) + 2))
+        sql = f"INSERT INTO contratos ({columnas}, creado_en, datos) VALUES ({marcadores})"
+        posicion_numero = COLUMNAS_INDEXADAS.index('contract_number')
+        posicion_fecha_fin = COLUMNAS_INDEXADAS.index('estimated_end_date')
+        ids = []
+        for fila, alerta_enviada in filas:
+            numero = fila[posicion_numero]
+            if rechazar_duplicados and numero is not None and self._existe_numero(conn, numero):
+                raise ContratoDuplicadoError(numero)
+            try:
+                id_contrato = conn.execute(sql, fila).lastrowid
+            except sqlite3.IntegrityError as e:
+                raise ContratoDuplicadoError(numero) from e
+            ids.append(id_contrato)
+            self._registrar_vencimiento(conn, id_contrato, fila[posicion_fecha_fin], alerta_enviada)
+            self._registrar_columnas(conn, json.loads(fila[-1]))
+        return ids
+
+    @staticmethod
+    def _existe_numero(conn, numero_contrato):
+        fila = conn.execute(
+            "SELECT 1 FROM contratos WHERE contract_number = ? COLLATE NOCASE LIMIT 1", (numero_contrato,)
+        ).fetchone()
+        return fila is not None
+
+    # --- Escritor único ---
+
+    def _encolar(self, operacion, *args, cambia_contratos=True):
+        """
+        Encola una operación de escritura y espera su resultado.
+
+        La operación se ejecuta en el hilo escritor como operacion(conn, *args), dentro de la
+        transacción del lote en curso. Si falla, solo se deshace esa operación y la excepción
+        se propaga a quien la encoló. Las operaciones que no tocan la tabla de contratos
+        (cambia_contratos=False) no cambian su versión, así la instantánea sigue vigente.
+        """
+        self._inicializar()
+        self._iniciar_escritor()
+        futuro = Future()
+        self._cola.put((operacion, args, futuro, cambia_contratos))
+        return futuro.result()
+
+    def _iniciar_escritor(self):
+        if self._hilo_escritor is not None:
+            return
+        with self._lock_inicio:
+            if self._hilo_escritor is None:
+                hilo = threading.Thread(target=self._bucle_escritor, name="registro-escritor", daemon=True)
+                hilo.start()
+                self._hilo_escritor = hilo
+
+    def _bucle_escritor(self):
+        conn = self._nueva_conexion()
+        while True:
+            lote = [self._cola.get()]
+            while len(lote) < MAX_OPERACIONES_POR_LOTE:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            self._ejecutar_lote(conn, lote)
+
+    def _ejecutar_lote(self, conn, lote):
+        """Ejecuta un lote de operaciones en una sola transacción y resuelve sus resultados."""
+        resultados = []
+        cambia_contratos = any(cambia for *_, cambia in lote)
+        try:
+            with self._transaccion(conn):
+                for operacion, args, futuro, _ in lote:
+                    # Cada operación va en su propio SAVEPOINT para que un error no descarte el lote
+                    conn.execute("SAVEPOINT operacion")
+                    try:
+                        resultados.append((futuro, operacion(conn, *args), None))
+                        conn.execute("RELEASE operacion")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO operacion")
+                        conn.execute("RELEASE operacion")
+                        resultados.append((futuro, None, e))
+                if cambia_contratos:
+                    self._incrementar_version(conn)
+        except Exception as e:
+            print(f"Error al confirmar el lote de {len(lote)} escrituras en {self.db_file}: {e}")
+            for _, _, futuro, _ in lote:
+                futuro.set_exception(e)
+            return
+        finally:
+            self._generacion += 1
+        for futuro, resultado, error in resultados:
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+        if cambia_contratos:
+            self._programar_instantanea()
+
+    def _programar_instantanea(self):
+        """
+        Regenera la instantánea cuando las escrituras se calman, en un hilo aparte, para que
+        el siguiente lector (la lista web o una exportación) la encuentre al día sin que
+        cada INSERT pague una reescritura completa.
+        """
+        if self._temporizador_instantanea is not None:
+            self._temporizador_instantanea.cancel()
+        temporizador = threading.Timer(DEMORA_INSTANTANEA, self._refrescar_instantanea)
+        temporizador.daemon = True
+        temporizador.start()
+        self._temporizador_instantanea = temporizador
+
+    def _refrescar_instantanea(self):
+        try:
+            self._vista()
+        except Exception as e:
+            print(f"Error al regenerar la instantánea {self.snapshot_file}: {e}")
+
+    # --- Escritura ---
+
+    def insertar_contrato(self, datos):
+        """
+        Agrega un contrato al registro con un único INSERT y devuelve su id.
+
+        Raises:
+            ContratoDuplicadoError: Si el contract_number ya está registrado.
+        """
+        return self._encolar(self._insertar_filas, [self._fila(datos)])[0]
+
+    def insertar_contratos(self, lista_datos):
+        """
+        Agrega varios contratos en una misma transacción y devuelve sus ids. Si alguno está
+        duplicado no se inserta ninguno y se lanza ContratoDuplicadoError.
+        """
+        return self._encolar(self._insertar_filas, [self._fila(datos) for datos in lista_datos])
+
+    def actualizar_alertas(self, cambios):
+        """
+        Actualiza la bandera de alerta de vencimiento en el índice de vencimientos. Solo se
+        escriben las filas de los contratos indicados; la instantánea del registro sigue vigente.
+
+        Args:
+            cambios (dict): {id_contrato: bool} con el nuevo estado de la alerta.
+        """
+        if not cambios:
+            return
+        filas = [(int(bool(enviada)), int(id_contrato)) for id_contrato, enviada in cambios.items()]
+        self._encolar(self._actualizar_alertas, filas, cambia_contratos=False)
+
+    @staticmethod
+    def _actualizar_alertas(conn, filas):
+        conn.executemany("UPDATE vencimientos SET alerta_enviada = ? WHERE id_contrato = ?", filas)
+
+    def reservar_rutas_pdf(self, entradas):
+        """
+        Asigna en el índice la ruta de los PDFs que se van a guardar, antes de escribirlos.
+
+        Args:
+            entradas (list): Tuplas (contract_number, ruta propuesta), con la ruta relativa a pdfs_laboral.
+
+        Returns:
+            list: Las rutas definitivas. Un contrato ya registrado conserva su ruta (y su tamaño,
+            checksum y ZIP hasta confirmar_pdf); uno nuevo recibe la propuesta o, si otro contrato
+            ya la usa, la misma con un sufijo _2, _3... y queda reservada sin tamaño ni checksum.
+        """
+        return self._encolar(self._reservar_rutas_pdf, list(entradas), cambia_contratos=False)
+
+    def reservar_ruta_pdf(self, numero_contrato, ruta):
+        """Reserva la ruta de un PDF (ver reservar_rutas_pdf) y devuelve la definitiva."""
+        return self.reservar_rutas_pdf([(numero_contrato, ruta)])[0]
+
+    @staticmethod
+    def _reservar_rutas_pdf(conn, entradas):
+        # Corre en el hilo escritor: elegir la ruta libre e insertarla no compite con otro guardado
+        rutas = []
+        guardado_en = datetime.now().isoformat(timespec='seconds')
+        for numero, ruta in entradas:
+            fila = conn.execute("SELECT ruta FROM archivos_pdf WHERE contract_number = ?", (numero,)).fetchone()
+            if fila is not None:
+                rutas.append(fila[0])
+                continue
+            base, extension = os.path.splitext(ruta)
+            sufijo = 2
+            while conn.execute("SELECT 1 FROM archivos_pdf WHERE ruta = ?", (ruta,)).fetchone():
+                ruta = f"{base}_{sufijo}{extension}"
+                sufijo += 1
+            conn.execute(
+                "INSERT INTO archivos_pdf (contract_number, ruta, tamano, sha256, guardado_en) VALUES (?, ?, 0, '', ?)",
+                (numero, ruta, guardado_en),
+            )
+            rutas.append(ruta)
+        return rutas
+
+    def confirmar_pdf(self, numero_contrato, tamano, sha256):
+        """
+        Registra el tamaño y el checksum de un PDF ya escrito en su ruta reservada. Volver a
+        guardar un PDF archivado lo deja de nuevo como archivo suelto.
+        """
+        self._encolar(self._confirmar_pdf, (tamano, sha256, datetime.now().isoformat(timespec='seconds'), numero_contrato),
+                      cambia_contratos=False)
+
+    @staticmethod
+    def _confirmar_pdf(conn, fila):
+        conn.execute(
+            "UPDATE archivos_pdf SET tamano = ?, sha256 = ?, guardado_en = ?, archivado_en = NULL WHERE contract_number = ?",
+            fila,
+        )
+
+    def marcar_pdfs_archivados(self, entradas):
+        """
+        Registra que los PDFs pasaron a un ZIP anual.
+
+        Args:
+            entradas (list): Tuplas (contract_number, ZIP relativo a pdfs_laboral, tamaño, sha256),
+                con el tamaño y el checksum del PDF tal como quedó dentro del ZIP.
+        """
+        filas = [(archivo, tamano, sha256, numero) for numero, archivo, tamano, sha256 in entradas]
+        if filas:
+            self._encolar(self._marcar_pdfs_archivados, filas, cambia_contratos=False)
+
+    @staticmethod
+    def _marcar_pdfs_archivados(conn, filas):
+        conn.executemany(
+            "UPDATE archivos_pdf SET archivado_en = ?, tamano = ?, sha256 = ? WHERE contract_number = ?", filas
+        )
+
+    def buscar_pdf(self, numero_contrato):
+        """Devuelve la entrada del índice de PDFs de un contrato (o None si no tiene PDF registrado)."""
+        numero_contrato = _texto(numero_contrato)
+        if numero_contrato is None:
+            return None
+        self._inicializar()
+        with self._conectar() as conn:
+            fila = conn.execute(
+                f"SELECT {', '.join(_COLUMNAS_PDF)} FROM archivos_pdf WHERE contract_number = ?", (numero_contrato,)
+            ).fetchone()
+        return None if fila is None else dict(zip(_COLUMNAS_PDF, fila))
+
+    def iterar_pdfs(self):
+        """Recorre todas las entradas del índice de PDFs, en orden de número de contrato."""
+        self._inicializar()
+        with self._conectar() as conn:
+            for fila in conn.execute(f"SELECT {', '.join(_COLUMNAS_PDF)} FROM archivos_pdf ORDER BY contract_number"):
+                yield dict(zip(_COLUMNAS_PDF, fila))
+
+    def pdfs_para_archivar(self, fecha_limite):
+        """
+        Devuelve los PDFs sueltos de contratos cuya estimated_end_date es anterior a fecha_limite
+        (AAAA-MM-DD), con esa fecha normalizada en la clave 'estimated_end_date'. La fecha se toma
+        del índice de vencimientos, así también se archivan los contratos con fechas d/m/A o m/d/A.
+        """
+        self._inicializar()
+        columnas = ", ".join(f"a.{col}" for col in _COLUMNAS_PDF)
+        with self._conectar() as conn:
+            filas = conn.execute(
+                f"SELECT {columnas}, v.fecha_fin FROM archivos_pdf a "
+                "JOIN contratos c ON c.contract_number = a.contract_number COLLATE NOCASE "
+                "JOIN vencimientos v ON v.id_contrato = c.id "
+                "WHERE a.archivado_en IS NULL AND v.fecha_fin < ? "
+                "ORDER BY v.fecha_fin",
+                (str(fecha_limite),),
+            ).fetchall()
+        return [dict(zip(_COLUMNAS_PDF + ('estimated_end_date',), fila)) for fila in filas]
+
+    # --- Bandeja de salida de correos ---
+
+    def encolar_correo(self, tipo, asunto, destinatarios, mensaje):
+        """
+        Guarda un correo en la bandeja de salida y devuelve su id.
+
+        Args:
+            tipo (str): 'contrato', 'alerta', ... (solo informativo).
+            asunto (str): Asunto del correo, para la vista /outbox.
+            destinatarios (list): Direcciones de destino.
+            mensaje (bytes): El mensaje MIME completo, listo para enviar.
+        """
+        return self.encolar_correos([(tipo, asunto, destinatarios, mensaje)])[0]
+
+    def encolar_correos(self, correos):
+        """
+        Guarda varios correos (tuplas tipo, asunto, destinatarios, mensaje) en la bandeja de
+        salida en una misma operación y devuelve sus ids: o quedan todos o ninguno.
+        """
+        ahora = datetime.now().isoformat(timespec='seconds')
+        filas = [
+            (tipo, asunto, json.dumps(list(destinatarios)), mensaje, CORREO_PENDIENTE, ahora, ahora)
+            for tipo, asunto, destinatarios, mensaje in correos
+        ]
+        return self._encolar(self._insertar_correos, filas, cambia_contratos=False)
+
+    @staticmethod
+    def _insertar_correos(conn, filas):
+        return [
+            conn.execute(
+                "INSERT INTO correos_salientes (tipo, asunto, destinatarios, mensaje, estado, proximo_intento, creado_en) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                fila,
+            ).lastrowid
+            for fila in filas
+        ]
+
+    def reclamar_correos(self, limite, reclamo_vencido):
+        """
+        Toma hasta `limite` correos pendientes cuyo próximo intento ya llegó y los marca como
+        'enviando', así otro proceso que también vacíe la bandeja no los envía dos veces.
+        Los que llevan en 'enviando' desde antes de `reclamo_vencido` (el proceso que los tomó
+        terminó sin resolverlos) vuelven a estar disponibles.
+
+        Returns:
+            list: Diccionarios con las columnas de _COLUMNAS_CORREO y el mensaje en 'mensaje'.
+        """
+        return self._encolar(self._reclamar_correos, limite, str(reclamo_vencido), cambia_contratos=False)
+
+    @staticmethod
+    def _reclamar_correos(conn, limite, reclamo_vencido):
+        ahora = datetime.now().isoformat(timespec='seconds')
+        conn.execute(
+            "UPDATE correos_salientes SET estado = ? WHERE estado = ? AND reclamado_en < ?",
+            (CORREO_PENDIENTE, CORREO_ENVIANDO, reclamo_vencido),
+        )
+        columnas = _COLUMNAS_CORREO + ('mensaje',)
+        filas = conn.execute(
+            f"SELECT {', '.join(columnas)} FROM correos_salientes WHERE estado = ? AND proximo_intento <= ? "
+            "ORDER BY proximo_intento, id LIMIT ?",
+            (CORREO_PENDIENTE, ahora, limite),
+        ).fetchall()
+        conn.executemany(
+            "UPDATE correos_salientes SET estado = ?, reclamado_en = ? WHERE id = ?",
+            [(CORREO_ENVIANDO, ahora, fila[0]) for fila in filas],
+        )
+        return [dict(zip(columnas, fila)) for fila in filas]
+
+    def registrar_envio_correo(self, id_correo, error=None, proximo_intento=None):
+        """
+        Anota el resultado de un intento de envío: sin error el correo queda 'enviado'; con
+        error vuelve a 'pendiente' para `proximo_intento`, o queda 'fallido' si no se indica.
+        """
+        ahora = datetime.now().isoformat(timespec='seconds')
+        if error is None:
+            fila = (CORREO_ENVIADO, ahora, None, ahora, id_correo)
+        else:
+            estado = CORREO_FALLIDO if proximo_intento is None else CORREO_PENDIENTE
+            fila = (estado, str(proximo_intento or ahora), str(error)[:1000], None, id_correo)
+        self._encolar(self._registrar_envio_correo, fila, cambia_contratos=False)
+
+    @staticmethod
+    def _registrar_envio_correo(conn, fila):
+        conn.execute(
+            "UPDATE correos_salientes SET estado = ?, intentos = intentos + 1, proximo_intento = ?, "
+            "ultimo_error = ?, enviado_en = ?, reclamado_en = NULL WHERE id = ?",
+            fila,
+        )
+
+    def reintentar_correo(self, id_correo):
+        """Devuelve a la cola un correo fallido, con los intentos en cero. Devuelve si existía y estaba fallido."""
+        ahora = datetime.now().isoformat(timespec='seconds')
+        return self._encolar(self._reintentar_correo, int(id_correo), ahora, cambia_contratos=False)
+
+    @staticmethod
+    def _reintentar_correo(conn, id_correo, ahora):
+        return conn.execute(
+            "UPDATE correos_salientes SET estado = ?, intentos = 0, proximo_intento = ? WHERE id = ? AND estado = ?",
+            (CORREO_PENDIENTE, ahora, id_correo, CORREO_FALLIDO),
+        ).rowcount > 0
+
+    def resumen_correos(self):
+        """Cantidad de correos de la bandeja por estado."""
+        self._inicializar()
+        with self._conectar() as conn:
+            conteos = dict(conn.execute("SELECT estado, COUNT(*) FROM correos_salientes GROUP BY estado"))
+        return {estado: conteos.get(estado, 0)
+                for estado in (CORREO_PENDIENTE, CORREO_ENVIANDO, CORREO_ENVIADO, CORREO_FALLIDO)}
+
+    def listar_correos(self, estados, limite=200):
+        """Correos de la bandeja en los estados dados, del más antiguo al más reciente (sin el mensaje)."""
+        estados = list(estados)
+        self._inicializar()
+        with self._conectar() as conn:
+            filas = conn.execute(
+                f"SELECT {', '.join(_COLUMNAS_CORREO)} FROM correos_salientes "
+                f"WHERE estado IN ({', '.join('?' for _ in estados)}) ORDER BY id LIMIT ?",
+                (*estados, limite),
+            ).fetchall()
+        correos = [dict(zip(_COLUMNAS_CORREO, fila)) for fila in filas]
+        for correo in correos:
+            correo['destinatarios'] = json.loads(correo['destinatarios'])
+        return correos
+
+    def _filas_desde_excel(self, ruta_excel):
+        """Lee un Excel con el formato de contratos_lab.xlsx y lo convierte en filas del registro."""
+        df = pd.read_excel(ruta_excel)
+        if df.empty:
+            return []
+        # to_json convierte NaN en null y los tipos de numpy en tipos nativos de JSON
+        registros = json.loads(df.to_json(orient="records", date_format="iso", force_ascii=False))
+        filas = []
+        for datos in registros:
+            alerta = datos.pop(COLUMNA_ALERTA, False)
+            filas.append(self._fila(datos, alerta_enviada=alerta))
+        return filas
+
+    def importar_excel(self, ruta_excel):
+        """Carga en el registro los contratos de un Excel con el formato de contratos_lab.xlsx."""
+        filas = self._filas_desde_excel(ruta_excel)
+        self._encolar(self._insertar_filas, filas, False)
+        print(f"Se importaron {len(filas)} contratos desde {ruta_excel} a {self.db_file}")
+        return len(filas)
+
+    # --- Lectura y exportación ---
+
+    def _firma(self):
+        """
+        Identifica el estado actual del registro sin leerlo: la generación de escrituras de
+        este proceso más la fecha de modificación y el tamaño de la base y de su WAL, que
+        cambian también cuando escribe otro proceso (por ejemplo alert_checker.py).
+        """
+        firma = [self._generacion]
+        for ruta in (self.db_file, self.db_file + "-wal"):
+            try:
+                st = os.stat(ruta)
+                firma.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                firma.append(None)
+        return tuple(firma)
+
+    def _vista(self):
+        """Devuelve la vista en caché del registro, recargándola solo si cambió la firma."""
+        self._inicializar()
+        firma = self._firma()
+        cache = self._cache
+        if cache is not None and cache.firma == firma:
+            return cache
+        with self._lock_cache:
+            cache = self._cache
+            if cache is not None and cache.firma == firma:
+                return cache
+            # La firma tomada antes de leer garantiza que una escritura concurrente invalide la caché
+            self._cache = VistaRegistro(firma, self._cargar_contratos())
+            return self._cache
+
+    def _cargar_contratos(self):
+        """
+        Carga el registro completo como DataFrame.
+
+        Primero intenta la instantánea (el DataFrame guardado por columnas en un solo JSON), que
+        se carga mucho más rápido que decodificar el JSON de cada fila. Si falta o su versión
+        no coincide con la de la base, lee SQLite y deja la instantánea al día.
+
+        La columna de alerta no va en la instantánea: se toma del índice de vencimientos, que
+        cambia sin cambiar la versión de los contratos.
+        """
+        with self._conectar() as conn:
+            conn.execute("BEGIN")  # lectura consistente de la versión, las filas y las alertas
+            version = self._leer_version(conn)
+            df = self._leer_instantanea(version)
+            filas = None
+            if df is None:
+                filas = conn.execute("SELECT id, datos FROM contratos ORDER BY id").fetchall()
+            alertados = [fila[0] for fila in conn.execute("SELECT id_contrato FROM vencimientos WHERE alerta_enviada = 1")]
+            conn.execute("COMMIT")
+        if filas is not None:
+            if not filas:
+                df = pd.DataFrame()
+            else:
+                ids = [fila[0] for fila in filas]
+                df = pd.DataFrame.from_records([json.loads(fila[1]) for fila in filas], index=ids)
+            self._guardar_instantanea(version, df)
+        if not df.empty:
+            df[COLUMNA_ALERTA] = df.index.isin(alertados)
+        return df
+
+    def _leer_instantanea(self, version):
+        """
+        Devuelve el DataFrame de la instantánea si existe y corresponde a la versión dada.
+        Es JSON y no pickle: quien pueda escribir el archivo no puede hacer que se ejecute código.
+        """
+        try:
+            with open(self.snapshot_file, encoding='utf-8') as f:
+                if int(f.readline()) != version:
+                    return None
+                datos = json.load(f)
+            return pd.DataFrame(datos['columnas'], index=datos['indice']).astype(datos['tipos'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Instantánea {self.snapshot_file} ilegible ({e}); se leerá la base de datos.")
+            return None
+
+    def _guardar_instantanea(self, version, df):
+        """Escribe la instantánea en un archivo temporal y la reemplaza de forma atómica."""
+        temporal = f"{self.snapshot_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            datos = {
+                'indice': df.index.tolist(),
+                'tipos': {columna: str(tipo) for columna, tipo in df.dtypes.items()},
+                'columnas': {columna: df[columna].tolist() for columna in df.columns},
+            }
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.write(f"{version}\n")
+                json.dump(datos, f)
+            os.replace(temporal, self.snapshot_file)
+        except Exception as e:
+            print(f"No se pudo guardar la instantánea {self.snapshot_file}: {e}")
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def leer_contratos(self):
+        """
+        Devuelve todos los contratos como DataFrame, con el id del registro como índice
+        y la columna de estado de alerta al final. El resultado es una copia que el
+        llamador puede modificar sin afectar la caché.
+        """
+        return self._vista().df.copy()
+
+    def leer_registros(self):
+        """
+        Devuelve los contratos como lista de diccionarios con los valores vacíos como '',
+        lista para renderizar. Es la lista en caché: no debe modificarse.
+        """
+        return self._vista().registros
+
+    def consultar_contratos(self, pagina=1, tamano=TAMANO_PAGINA_POR_DEFECTO, orden=None, descendente=False, filtro=''):
+        """
+        Devuelve una página de contratos filtrada y ordenada.
+
+        Args:
+            pagina (int): Número de página, empezando en 1.
+            tamano (int): Filas por página (se limita a TAMANO_PAGINA_MAXIMO).
+            orden (str): Columna por la que se ordena; None conserva el orden de registro.
+            descendente (bool): Invierte el orden.
+            filtro (str): Texto a buscar en cualquier columna, sin distinguir mayúsculas.
+
+        Returns:
+            dict: columnas, filas de la página, total de filas filtradas y datos de paginación.
+        """
+        vista = self._vista()
+        tamano = max(1, min(int(tamano), TAMANO_PAGINA_MAXIMO))
+        indices = range(len(vista.registros))
+        filtro = (filtro or '').strip()
+        if filtro:
+            buscado = filtro.upper()
+            indices = [i for i in indices if buscado in vista.textos_busqueda[i]]
+        if orden in vista.columnas:
+            indices = sorted(indices, key=lambda i: _clave_orden(vista.registros[i][orden]), reverse=descendente)
+        elif descendente:
+            indices = list(reversed(indices))
+        total = len(indices)
+        paginas = max(1, -(-total // tamano))
+        pagina = max(1, min(int(pagina), paginas))
+        inicio = (pagina - 1) * tamano
+        return {
+            'columnas': vista.columnas,
+            'filas': [vista.registros[i] for i in indices[inicio:inicio + tamano]],
+            'total': total,
+            'pagina': pagina,
+            'paginas': paginas,
+            'tamano': tamano,
+            'orden': orden if orden in vista.columnas else None,
+            'descendente': descendente,
+            'filtro': filtro,
+        }
+
+    # --- Búsquedas por índice ---
+
+    def _buscar(self, condicion, valor):
+        """Devuelve los contratos que cumplen la condición SQL dada, como diccionarios."""
+        self._inicializar()
+        with self._conectar() as conn:
+            filas = conn.execute(
+                "SELECT c.id, COALESCE(v.alerta_enviada, 0), c.datos FROM contratos c "
+                f"LEFT JOIN vencimientos v ON v.id_contrato = c.id WHERE {condicion} ORDER BY c.id", (valor,)
+            ).fetchall()
+        contratos = []
+        for id_contrato, alerta_enviada, datos in filas:
+            contrato = json.loads(datos)
+            contrato['id'] = id_contrato
+            contrato[COLUMNA_ALERTA] = bool(alerta_enviada)
+            contratos.append(contrato)
+        return contratos
+
+    def existe_contrato(self, numero_contrato):
+        """Indica si el número de contrato ya está registrado."""
+        numero_contrato = _texto(numero_contrato)
+        if numero_contrato is None:
+            return False
+        self._inicializar()
+        with self._conectar() as conn:
+            return self._existe_numero(conn, numero_contrato)
+
+    def buscar_por_numero(self, numero_contrato):
+        """Devuelve el contrato con ese número (o None si no existe)."""
+        contratos = self._buscar("contract_number = ? COLLATE NOCASE", _texto(numero_contrato))
+        return contratos[0] if contratos else None
+
+    def buscar_por_cedula(self, cedula):
+        """Devuelve todos los contratos de un trabajador."""
+        return self._buscar("contractor_id = ?", _texto(cedula))
+
+    def buscar_por_proyecto(self, proyecto):
+        """Devuelve todos los contratos de un proyecto o centro de costos."""
+        return self._buscar("project_name = ?", _texto(proyecto))
+
+    # --- Vencimientos ---
+
+    def contratos_por_vencer(self, desde, hasta):
+        """
+        Contratos sin alerta enviada cuya fecha final estimada está entre desde y hasta
+        (AAAA-MM-DD, ambas incluidas). Recorre solo ese tramo del índice de vencimientos, así
+        el costo depende de los contratos de la ventana y no del tamaño del registro.
+
+        Returns:
+            list: (id_contrato, fecha_fin, datos del contrato) ordenados por fecha.
+        """
+        self._inicializar()
+        with self._conectar() as conn:
+            filas = conn.execute(
+                "SELECT v.id_contrato, v.fecha_fin, c.datos FROM vencimientos v "
+                "JOIN contratos c ON c.id = v.id_contrato "
+                "WHERE v.fecha_fin BETWEEN ? AND ? AND v.alerta_enviada = 0 "
+                "ORDER BY v.fecha_fin, v.id_contrato",
+                (desde, hasta),
+            ).fetchall()
+        return [(id_contrato, fecha_fin, json.loads(datos)) for id_contrato, fecha_fin, datos in filas]
+
+    def alertas_vencidas(self, hasta):
+        """Ids de los contratos con la alerta enviada cuya fecha final es hasta (AAAA-MM-DD) o anterior."""
+        self._inicializar()
+        with self._conectar() as conn:
+            return [fila[0] for fila in conn.execute(
+                "SELECT id_contrato FROM vencimientos WHERE alerta_enviada = 1 AND fecha_fin <= ?", (hasta,)
+            )]
+
+    def fechas_fin_invalidas(self):
+        """Números de los contratos cuya fecha final estimada no se pudo interpretar."""
+        self._inicializar()
+        with self._conectar() as conn:
+            return [fila[0] for fila in conn.execute(
+                "SELECT c.contract_number FROM vencimientos v JOIN contratos c ON c.id = v.id_contrato "
+                "WHERE v.fecha_fin IS NULL ORDER BY v.id_contrato"
+            )]
+
+    # --- Recorrido por bloques para exportaciones ---
+
+    def columnas_exportacion(self):
+        """Columnas de los contratos en orden de aparición, más la columna de alerta al final."""
+        self._inicializar()
+        with self._conectar() as conn:
+            columnas = [fila[0] for fila in conn.execute("SELECT nombre FROM columnas_datos ORDER BY posicion")]
+        return columnas + [COLUMNA_ALERTA]
+
+    def iterar_contratos(self, desde=None, hasta=None, proyecto=None, tipo_contrato=None, tamano_bloque=500):
+        """
+        Recorre los contratos en orden de registro sin cargarlos todos en memoria.
+
+        Args:
+            desde (str): Fecha de inicio mínima (start_date >= desde), formato AAAA-MM-DD.
+            hasta (str): Fecha de inicio máxima (start_date <= hasta), formato AAAA-MM-DD.
+            proyecto (str): Solo contratos de este project_name.
+            tipo_contrato (str): Solo contratos de este tipo.
+            tamano_bloque (int): Filas que se leen de la base en cada consulta.
+
+        Yields:
+            dict: Los datos de cada contrato, con la columna de alerta.
+        """
+        condiciones, parametros = [], []
+        for condicion, valor in (
+            ("start_date >= ?", desde),
+            ("start_date <= ?", hasta),
+            ("project_name = ?", proyecto),
+            ("tipo_contrato = ?", tipo_contrato),
+        ):
+            valor = _texto(valor)
+            if valor is not None:
+                condiciones.append(condicion)
+                parametros.append(valor)
+        where = " AND ".join(condiciones) or "1"
+        self._inicializar()
+        with self._conectar() as conn:
+            # Paginación por id (keyset): cada bloque es una consulta corta que usa la clave primaria
+            ultimo_id = 0
+            while True:
+                filas = conn.execute(
+                    "SELECT c.id, COALESCE(v.alerta_enviada, 0), c.datos FROM contratos c "
+                    f"LEFT JOIN vencimientos v ON v.id_contrato = c.id WHERE c.id > ? AND {where} ORDER BY c.id LIMIT ?",
+                    (ultimo_id, *parametros, tamano_bloque),
+                ).fetchall()
+                if not filas:
+                    return
+                for id_contrato, alerta_enviada, datos in filas:
+                    contrato = json.loads(datos)
+                    contrato[COLUMNA_ALERTA] = bool(alerta_enviada)
+                    yield contrato
+                ultimo_id = filas[-1][0]
+
+    def exportar_excel(self, ruta_excel=None):
+        """Genera el Excel de contratos a partir del registro y devuelve su ruta."""
+        ruta_excel = ruta_excel or self.excel_file
+        total = escribir_xlsx(ruta_excel, self.columnas_exportacion(), self.iterar_contratos())
+        print(f"Registro exportado a {ruta_excel} ({total} contratos)")
+        return ruta_excel
+
+
+# Instancia compartida por la aplicación web y el verificador de alertas
+registro = RegistroContratos()
+
+
+if __name__ == '__main__':
+    # Uso: python registro_contratos.py [ruta_excel_destino]
+    registro.exportar_excel(sys.argv[1] if len(sys.argv) > 1 else None)
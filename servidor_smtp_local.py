@@ -0,0 +1,200 @@
+# servidor_smtp_local.py
+# Servidor SMTP de prueba que corre en la propia máquina y no entrega nada: acepta cualquier
+# login, recibe los mensajes y solo los cuenta (y guarda los últimos en memoria).
+# Sirve para probar email_sender.py, la bandeja de salida y el verificador de alertas sin
+# credenciales de Gmail, y lo usa benchmark_correo.py para medir el envío de correos.
+#
+# Uso:
+#   python servidor_smtp_local.py --puerto 2525
+# y en otra terminal, con las variables apuntando a él:
+#   set SMTP_HOST=127.0.0.1
+#   set SMTP_PORT=2525
+#   set SMTP_SSL=0
+#   python alert_checker.py
+
+import argparse
+import socketserver
+import threading
+from collections import deque
+from email import message_from_bytes
+
+# Mensajes recibidos que se conservan en memoria (los más recientes)
+MENSAJES_GUARDADOS = 100
+# Tamaño máximo de una línea de comando SMTP
+LONGITUD_MAXIMA_LINEA = 4096
+TAMANO_MAXIMO_MENSAJE = 35 * 1024 * 1024
+
+
+class _ManejadorSMTP(socketserver.StreamRequestHandler):
+    """Atiende una conexión SMTP: EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP y QUIT."""
+
+    def _responder(self, codigo, texto):
+        self.wfile.write(f"{codigo} {texto}\r\n".encode('utf-8'))
+
+    def _leer_linea(self):
+        """Lee una línea de comando, o devuelve None si el cliente cerró la conexión."""
+        linea = self.rfile.readline(LONGITUD_MAXIMA_LINEA)
+        return linea.decode('utf-8', 'replace').rstrip('\r\n') if linea else None
+
+    def _leer_datos(self):
+        """Lee el cuerpo de DATA hasta la línea con un solo punto, quitando el punto de relleno."""
+        lineas = []
+        while True:
+            linea = self.rfile.readline(TAMANO_MAXIMO_MENSAJE)
+            if not linea or linea in (b'.\r\n', b'.\n'):
+                return b''.join(lineas)
+            lineas.append(linea[1:] if linea.startswith(b'..') else linea)
+
+    def _autenticar(self, argumento):
+        mecanismo, _, inicial = argumento.partition(' ')
+        mecanismo = mecanismo.upper()
+        if mecanismo == 'PLAIN':
+            if not inicial:
+                self._responder(334, "")
+                self._leer_linea()
+        elif mecanismo == 'LOGIN':
+            if not inicial:
+                self._responder(334, "VXNlcm5hbWU6")
+                self._leer_linea()
+            self._responder(334, "UGFzc3dvcmQ6")
+            self._leer_linea()
+        else:
+            self._responder(504, "Mecanismo de autenticación no soportado")
+            return
+        self._responder(235, "Autenticado")
+
+    def handle(self):
+        sink = self.server.sink
+        sink._contar_conexion()
+        self._responder(220, "localhost ESMTP servidor de prueba")
+        remitente, destinatarios = None, []
+        while True:
+            linea = self._leer_linea()
+            if linea is None:
+                # El cliente cerró la conexión sin QUIT
+                return
+            comando, _, argumento = linea.partition(' ')
+            comando = comando.upper()
+            if comando == 'EHLO':
+                self.wfile.write(b"250-localhost\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n"
+                                 b"250 SIZE %d\r\n" % TAMANO_MAXIMO_MENSAJE)
+            elif comando == 'HELO':
+                self._responder(250, "localhost")
+            elif comando == 'AUTH':
+                self._autenticar(argumento)
+            elif comando == 'MAIL':
+                remitente, destinatarios = argumento.partition(':')[2].strip().split(' ')[0], []
+                self._responder(250, "OK")
+            elif comando == 'RCPT':
+                destinatarios.append(argumento.partition(':')[2].strip().split(' ')[0])
+                self._responder(250, "OK")
+            elif comando == 'DATA':
+                if not destinatarios:
+                    self._responder(503, "Falta RCPT")
+                    continue
+                self._responder(354, "Fin de datos con <CR><LF>.<CR><LF>")
+                sink._recibir(remitente, destinatarios, self._leer_datos())
+                remitente, destinatarios = None, []
+                self._responder(250, "OK: mensaje recibido")
+            elif comando == 'RSET':
+                remitente, destinatarios = None, []
+                self._responder(250, "OK")
+            elif comando == 'NOOP':
+                self._responder(250, "OK")
+            elif comando == 'QUIT':
+                self._responder(221, "Adiós")
+                return
+            else:
+                self._responder(502, "Comando no implementado")
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorSMTPLocal:
+    """
+    Servidor SMTP de prueba en un hilo del proceso. Con port=0 el sistema elige un puerto libre.
+
+        with ServidorSMTPLocal() as servidor:
+            os.environ.update(SMTP_HOST=servidor.host, SMTP_PORT=str(servidor.port), SMTP_SSL='0')
+            ...
+            servidor.esperar_mensajes(10)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, mensajes_guardados=MENSAJES_GUARDADOS, mostrar=False):
+        self._servidor = _ServidorTCP((host, port), _ManejadorSMTP, bind_and_activate=False)
+        self._servidor.sink = self
+        self.mostrar = mostrar
+        self.conexiones = 0
+        self.mensajes = 0
+        self.bytes_recibidos = 0
+        self.ultimos_mensajes = deque(maxlen=mensajes_guardados)
+        self._condicion = threading.Condition()
+        self._hilo = None
+
+    @property
+    def host(self):
+        return self._servidor.server_address[0]
+
+    @property
+    def port(self):
+        return self._servidor.server_address[1]
+
+    def iniciar(self):
+        self._servidor.server_bind()
+        self._servidor.server_activate()
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name="smtp-local", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+    def _contar_conexion(self):
+        with self._condicion:
+            self.conexiones += 1
+
+    def _recibir(self, remitente, destinatarios, datos):
+        with self._condicion:
+            self.mensajes += 1
+            self.bytes_recibidos += len(datos)
+            self.ultimos_mensajes.append((remitente, destinatarios, datos))
+            self._condicion.notify_all()
+        if self.mostrar:
+            asunto = message_from_bytes(datos).get('Subject', '')
+            print(f"📬 {remitente} -> {', '.join(destinatarios)}: {asunto} ({len(datos)} bytes)")
+
+    def esperar_mensajes(self, cantidad, tiempo_maximo=60):
+        """Espera a haber recibido en total `cantidad` mensajes. Devuelve si se alcanzó a tiempo."""
+        with self._condicion:
+            return self._condicion.wait_for(lambda: self.mensajes >= cantidad, tiempo_maximo)
+
+    def reiniciar_contadores(self):
+        with self._condicion:
+            self.conexiones = self.mensajes = self.bytes_recibidos = 0
+            self.ultimos_mensajes.clear()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor SMTP local de prueba: recibe los correos y no los entrega.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=2525)
+    args = parser.parse_args()
+
+    servidor = ServidorSMTPLocal(args.host, args.puerto, mostrar=True).iniciar()
+    print(f"Servidor SMTP de prueba en {servidor.host}:{servidor.port}. Configure SMTP_HOST={servidor.host}, "
+          f"SMTP_PORT={servidor.port} y SMTP_SSL=0. Ctrl+C para terminar.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.detener()
+        print(f"\n{servidor.mensajes} mensajes recibidos en {servidor.conexiones} conexiones.")
@@ -0,0 +1,70 @@
+# Pruebas de concurrencia del registro de contratos: las escrituras simultáneas pasan por el
+# hilo escritor y ninguna se pierde ni se duplica.
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app_laboral
+from email_sender import DATOS_EJEMPLO
+from registro_contratos import RegistroContratos, ContratoDuplicadoError
+
+N = 50
+
+
+@pytest.fixture
+def registro_temporal(tmp_path):
+    return RegistroContratos(db_file=str(tmp_path / "contratos.db"), excel_file=str(tmp_path / "no_existe.xlsx"))
+
+
+def _filas(db_file):
+    with sqlite3.connect(db_file) as conn:
+        return [numero for (numero,) in conn.execute("SELECT contract_number FROM contratos")]
+
+
+def _datos(numero):
+    return dict(DATOS_EJEMPLO, contract_number=numero)
+
+
+def test_inserciones_paralelas(registro_temporal):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        ids = list(pool.map(lambda i: registro_temporal.insertar_contrato(_datos(f"PAR-{i}")), range(N)))
+
+    numeros = _filas(registro_temporal.db_file)
+    assert len(numeros) == N
+    assert len(set(numeros)) == N
+    assert len(set(ids)) == N
+
+
+def test_mismo_numero_en_paralelo(registro_temporal):
+    def insertar(_):
+        try:
+            registro_temporal.insertar_contrato(_datos("DUP-1"))
+            return True
+        except ContratoDuplicadoError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        insertados = list(pool.map(insertar, range(N)))
+
+    assert insertados.count(True) == 1
+    assert _filas(registro_temporal.db_file) == ["DUP-1"]
+
+
+def test_posts_paralelos(registro_temporal, monkeypatch):
+    # Solo se prueba el registro: la generación del PDF y el correo no se encolan
+    monkeypatch.setattr(app_laboral, "registro", registro_temporal)
+    monkeypatch.setattr(app_laboral.cola_trabajos, "encolar", lambda *args, **kwargs: type("T", (), {"id": "x"})())
+
+    def post(i):
+        datos = {k: v for k, v in _datos(f"WEB-{i}").items() if k != 'tipo_contrato'}
+        return app_laboral.app.test_client().post("/create/termino-fijo", data=datos).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        codigos = list(pool.map(post, range(N)))
+
+    assert codigos == [302] * N
+    numeros = _filas(registro_temporal.db_file)
+    assert len(numeros) == N
+    assert sorted(numeros) == sorted(f"WEB-{i}" for i in range(N))
@@ -0,0 +1,129 @@
+# trabajos.py
+# Cola de trabajos en segundo plano.
+# Las rutas que crean contratos registran el contrato y encolan aquí la parte lenta
+# (generar el PDF y enviar el correo); la respuesta sale de inmediato con el id del trabajo
+# y el avance se consulta en /jobs/<id>.
+
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Hilos que procesan trabajos a la vez
+TRABAJADORES = 2
+# Trabajos terminados que se conservan en memoria para consultar su estado
+MAX_TRABAJOS_GUARDADOS = 500
+
+EN_COLA = 'en_cola'
+EN_PROCESO = 'en_proceso'
+TERMINADO = 'terminado'
+FALLIDO = 'error'
+
+
+class Trabajo:
+    """Estado de un trabajo. Lo actualiza el hilo que lo ejecuta y lo leen las rutas web."""
+
+    def __init__(self, descripcion, total_pasos, resultado=None):
+        self.id = uuid.uuid4().hex
+        self.descripcion = descripcion
+        self.total_pasos = total_pasos
+        self.pasos_completados = 0
+        self.paso = "En cola"
+        self.estado = EN_COLA
+        self.error = None
+        self.resultado = dict(resultado or {})
+        self.creado_en = datetime.now()
+        self.terminado_en = None
+        self._lock = threading.Lock()
+
+    def avanzar(self, paso):
+        """Marca como completado el paso anterior e inicia el siguiente."""
+        with self._lock:
+            if self.estado == EN_PROCESO:
+                self.pasos_completados += 1
+            self.estado = EN_PROCESO
+            self.paso = paso
+
+    def terminar(self, error=None):
+        with self._lock:
+            self.terminado_en = datetime.now()
+            if error is None:
+                self.estado = TERMINADO
+                self.pasos_completados = self.total_pasos
+                self.paso = "Terminado"
+            else:
+                self.estado = FALLIDO
+                self.error = error
+
+    @property
+    def finalizado(self):
+        return self.estado in (TERMINADO, FALLIDO)
+
+    def como_dict(self):
+        with self._lock:
+            return {
+                'id': self.id,
+                'descripcion': self.descripcion,
+                'estado': self.estado,
+                'paso': self.paso,
+                'progreso': round(100 * self.pasos_completados / self.total_pasos) if self.total_pasos else 100,
+                'error': self.error,
+                'resultado': dict(self.resultado),
+                'creado_en': self.creado_en.isoformat(timespec='seconds'),
+                'terminado_en': self.terminado_en.isoformat(timespec='seconds') if self.terminado_en else None,
+            }
+
+
+class ColaTrabajos:
+    """Ejecuta trabajos en un pool de hilos y guarda su estado para consultarlo por id."""
+
+    def __init__(self, trabajadores=TRABAJADORES, max_guardados=MAX_TRABAJOS_GUARDADOS):
+        self.max_guardados = max_guardados
+        self._pool = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="trabajo")
+        self._trabajos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encolar(self, descripcion, funcion, *args, total_pasos=1, resultado=None):
+        """
+        Encola funcion(trabajo, *args) y devuelve el Trabajo creado.
+        La función informa su avance con trabajo.avanzar(...) y puede guardar datos en
+        trabajo.resultado (que empieza con `resultado`); si lanza una excepción el trabajo
+        queda en estado de error.
+        """
+        trabajo = Trabajo(descripcion, total_pasos, resultado)
+        with self._lock:
+            self._trabajos[trabajo.id] = trabajo
+            self._descartar_antiguos()
+        self._pool.submit(self._ejecutar, trabajo, funcion, args)
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        with self._lock:
+            return self._trabajos.get(id_trabajo)
+
+    def _descartar_antiguos(self):
+        # Solo se descartan trabajos ya finalizados, empezando por los más antiguos
+        sobrantes = len(self._trabajos) - self.max_guardados
+        if sobrantes <= 0:
+            return
+        for id_trabajo in [i for i, t in self._trabajos.items() if t.finalizado][:sobrantes]:
+            del self._trabajos[id_trabajo]
+
+    @staticmethod
+    def _ejecutar(trabajo, funcion, args):
+        try:
+            funcion(trabajo, *args)
+        except Exception as e:
+            print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            print(f"Error en el trabajo '{trabajo.descripcion}': {e}")
+            print(traceback.format_exc())
+            print(f"!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            trabajo.terminar(error=str(e))
+        else:
+            trabajo.terminar()
+
+
+# Cola compartida por la aplicación web
+cola_trabajos = ColaTrabajos()
@@ -0,0 +1,209 @@
+# transporte_correo.py
+# Transporte SMTP compartido por los correos de contratos y de alertas.
+# Antes cada correo abría su propia conexión SSL con Gmail (handshake TLS + login). Aquí las
+# conexiones ya autenticadas se guardan en un pool y se reutilizan:
+#   - una conexión que estuvo inactiva un rato se prueba con NOOP antes de usarla, y si lleva
+#     demasiado tiempo sin uso se cierra (el servidor la habría cortado de todos modos);
+#   - si el servidor cortó la conexión durante un envío, se abre otra y se reintenta una vez;
+#   - dentro de `with transporte_correo.sesion():` todos los envíos del hilo usan la misma
+#     conexión (lo usa el verificador de alertas para mandar todas sus alertas en una sesión).
+#
+# Servidor configurable con variables de entorno (por defecto Gmail por SSL):
+#   SMTP_HOST=smtp.gmail.com  SMTP_PORT=465  SMTP_SSL=1
+# Con SMTP_SSL=0 se usa SMTP sin cifrar, o STARTTLS si el servidor lo ofrece.
+# Las credenciales siguen siendo GMAIL_SENDER_EMAIL y GMAIL_APP_PASSWORD.
+
+import os
+import smtplib
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+SMTP_HOST_POR_DEFECTO = "smtp.gmail.com"
+SMTP_PORT_POR_DEFECTO = 465
+# Conexiones inactivas que se conservan en el pool
+MAX_CONEXIONES_INACTIVAS = 2
+# Segundos sin uso a partir de los cuales se prueba la conexión con NOOP antes de enviar
+SEGUNDOS_ANTES_DE_NOOP = 30
+# Segundos sin uso a partir de los cuales la conexión se descarta sin probarla
+SEGUNDOS_MAXIMO_INACTIVA = 240
+TIMEOUT_SMTP = 30
+
+# Errores que indican que la conexión ya no sirve (y no que el mensaje sea inválido). No se
+# incluye OSError: todas las excepciones de smtplib derivan de él, también las de un
+# destinatario rechazado o credenciales inválidas, que no se arreglan reconectando.
+_ERRORES_DE_CONEXION = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, socket.timeout)
+# Respuestas de error del servidor: se propagan sin reconectar ni reenviar
+_ERRORES_PERMANENTES = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+def _activado(valor):
+    return str(valor).strip().lower() not in ('0', 'false', 'no', '')
+
+
+class _Conexion:
+    """Una conexión SMTP autenticada y el momento de su último uso."""
+
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.ultimo_uso = time.monotonic()
+
+    def cerrar(self):
+        try:
+            self.servidor.quit()
+        except Exception:
+            self.servidor.close()
+
+
+class TransporteSMTP:
+    """Pool de conexiones SMTP autenticadas, seguro para usar desde varios hilos."""
+
+    def __init__(self, host=None, port=None, ssl=None, usuario=None, contrasena=None,
+                 max_inactivas=MAX_CONEXIONES_INACTIVAS):
+        # Lo que no se indica se lee del entorno en cada conexión nueva, así un cambio en las
+        # variables (p. ej. el banco de pruebas apuntando a un servidor local) se respeta
+        self._host = host
+        self._port = port
+        self._ssl = ssl
+        self._usuario = usuario
+        self._contrasena = contrasena
+        self.max_inactivas = max_inactivas
+        self._inactivas = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.conexiones_abiertas = 0
+        self.mensajes_enviados = 0
+
+    @property
+    def host(self):
+        return self._host or os.getenv("SMTP_HOST") or SMTP_HOST_POR_DEFECTO
+
+    @property
+    def port(self):
+        return int(self._port or os.getenv("SMTP_PORT") or SMTP_PORT_POR_DEFECTO)
+
+    @property
+    def ssl(self):
+        return self._ssl if self._ssl is not None else _activado(os.getenv("SMTP_SSL", "1"))
+
+    @property
+    def usuario(self):
+        return self._usuario or os.getenv("GMAIL_SENDER_EMAIL")
+
+    @property
+    def contrasena(self):
+        return self._contrasena or os.getenv("GMAIL_APP_PASSWORD")
+
+    def _conectar(self):
+        if self.ssl:
+            servidor = smtplib.SMTP_SSL(self.host, self.port, timeout=TIMEOUT_SMTP)
+        else:
+            servidor = smtplib.SMTP(self.host, self.port, timeout=TIMEOUT_SMTP)
+            servidor.ehlo()
+            if servidor.has_extn('starttls'):
+                servidor.starttls()
+                servidor.ehlo()
+        try:
+            if self.usuario and self.contrasena:
+                servidor.login(self.usuario, self.contrasena)
+        except Exception:
+            servidor.close()
+            raise
+        with self._lock:
+            self.conexiones_abiertas += 1
+        return _Conexion(servidor)
+
+    @staticmethod
+    def _sigue_viva(conexion):
+        try:
+            return conexion.servidor.noop()[0] == 250
+        except _ERRORES_DE_CONEXION:
+            return False
+
+    def _tomar(self):
+        """Devuelve una conexión del pool que siga viva, o una nueva si no hay."""
+        while True:
+            with self._lock:
+                conexion = self._inactivas.pop() if self._inactivas else None
+            if conexion is None:
+                return self._conectar()
+            inactiva = time.monotonic() - conexion.ultimo_uso
+            if inactiva < SEGUNDOS_ANTES_DE_NOOP:
+                return conexion
+            if inactiva < SEGUNDOS_MAXIMO_INACTIVA and self._sigue_viva(conexion):
+                return conexion
+            conexion.cerrar()
+
+    def _devolver(self, conexion):
+        conexion.ultimo_uso = time.monotonic()
+        with self._lock:
+            if len(self._inactivas) < self.max_inactivas:
+                self._inactivas.append(conexion)
+                return
+        conexion.cerrar()
+
+    def _enviar_por(self, conexion, mensaje):
+        conexion.servidor.send_message(mensaje)
+        conexion.ultimo_uso = time.monotonic()
+        with self._lock:
+            self.mensajes_enviados += 1
+
+    def enviar(self, mensaje):
+        """
+        Envía un mensaje (email.message.Message con From y To) por una conexión del pool.
+        Si la conexión se cortó se reintenta una vez con una conexión nueva; los demás errores
+        (destinatario rechazado, credenciales inválidas...) se propagan.
+        """
+        en_sesion = getattr(self._local, 'en_sesion', False)
+        conexion = (self._local.conexion if en_sesion else None) or self._tomar()
+        try:
+            try:
+                self._enviar_por(conexion, mensaje)
+            except _ERRORES_PERMANENTES:
+                raise
+            except _ERRORES_DE_CONEXION:
+                conexion.cerrar()
+                conexion = self._conectar()
+                self._enviar_por(conexion, mensaje)
+        except Exception:
+            conexion.cerrar()
+            if en_sesion:
+                self._local.conexion = None
+            raise
+        if en_sesion:
+            self._local.conexion = conexion
+        else:
+            self._devolver(conexion)
+
+    @contextmanager
+    def sesion(self):
+        """
+        Mientras dure el bloque, los envíos de este hilo usan una sola conexión. La conexión
+        se abre con el primer envío, así una sesión sin correos no toca el servidor.
+        """
+        if getattr(self._local, 'en_sesion', False):
+            # Sesión anidada: se sigue usando la de afuera
+            yield self
+            return
+        self._local.en_sesion = True
+        self._local.conexion = None
+        try:
+            yield self
+        finally:
+            conexion = self._local.conexion
+            self._local.en_sesion = False
+            self._local.conexion = None
+            if conexion is not None:
+                self._devolver(conexion)
+
+    def cerrar(self):
+        """Cierra las conexiones inactivas del pool."""
+        with self._lock:
+            inactivas, self._inactivas = self._inactivas, []
+        for conexion in inactivas:
+            conexion.cerrar()
+
+
+# Transporte compartido por la aplicación, la carga masiva y el verificador de alertas
+transporte_correo = TransporteSMTP()